@@ -0,0 +1,72 @@
+import io
+import time
+import zipfile
+import zlib
+from itertools import islice, product
+
+from multiprocessing import Value
+
+from door_hacking import ZipCryptoVerifier, password_at, try_password_range
+
+ZIP_PATH = './emergency_storage_key.zip'
+CHARSET = 'abcdefghijklmnopqrstuvwxyz0123456789'
+# 벤치마크용 후보 수
+CANDIDATE_COUNT = 200000
+
+
+def make_candidates(count, prefix='ma', length=6):
+    tails = islice(product(CHARSET, repeat=length - len(prefix)), count)
+    return [(prefix + ''.join(tail)).encode('utf-8') for tail in tails]
+
+
+# 기존 방식: 후보마다 zipfile로 열어서 1바이트 읽기
+def run_zipfile(zip_bytes, target_file, candidates):
+    zip_obj = zipfile.ZipFile(io.BytesIO(zip_bytes))
+    for password in candidates:
+        try:
+            zip_obj.open(target_file, pwd=password).read(1)
+        except (RuntimeError, zipfile.BadZipFile, zlib.error):
+            pass
+
+
+def run_verifier(zip_bytes, target_file, candidates):
+    verifier = ZipCryptoVerifier(zip_bytes, target_file)
+    for password in candidates:
+        if verifier.check(password):
+            verifier.verify(password)
+
+
+# 접두어까지의 키를 재사용하는 경우
+def run_verifier_prefix(zip_bytes, target_file, candidates, prefix=b'ma'):
+    verifier = ZipCryptoVerifier(zip_bytes, target_file)
+    prefix_keys = verifier.password_keys(prefix)
+    for password in candidates:
+        if verifier.check(password[len(prefix):], prefix_keys):
+            verifier.verify(password)
+
+
+# 주행 거리계로 같은 후보를 만들면서 바뀐 자리부터만 키를 다시 계산하는 경우
+def run_odometer(zip_bytes, target_file, candidates):
+    verifier = ZipCryptoVerifier(zip_bytes, target_file)
+    alphabets = [CHARSET.encode('utf-8')] * len(candidates[0])
+    start = CHARSET.index('m') * len(CHARSET) ** 5
+    assert password_at(start, alphabets) == candidates[0]
+    try_password_range(verifier, alphabets, start, start + len(candidates), Value('b', False))
+
+
+def measure(run, zip_bytes, target_file, candidates):
+    start = time.perf_counter()
+    run(zip_bytes, target_file, candidates)
+    return len(candidates) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    with open(ZIP_PATH, 'rb') as f:
+        zip_bytes = f.read()
+    target_file = zipfile.ZipFile(io.BytesIO(zip_bytes)).namelist()[0]
+    candidates = make_candidates(CANDIDATE_COUNT)
+
+    print(f'후보 수: {CANDIDATE_COUNT}')
+    for name, run in [('zipfile.open', run_zipfile), ('헤더 확인', run_verifier), ('헤더 확인 + 접두어 키 재사용', run_verifier_prefix),
+                      ('헤더 확인 + 주행 거리계', run_odometer)]:
+        print(f'[{name}] 초당 {measure(run, zip_bytes, target_file, candidates):,.0f}회')
@@ -1,62 +1,594 @@
+import argparse
 import io
+import json
+import queue
+import signal
+import struct
 import zipfile
 import time
-import zlib
-from itertools import product
-from multiprocessing import Process, Value, Lock, Array, current_process
+from functools import lru_cache
+from multiprocessing import Process, Queue, Value, Lock, current_process
 import os
 
+# ZipCrypto(PKWARE 전통 암호화) 키 초기값과 암호화 헤더 길이
+ZIPCRYPTO_INITIAL_KEYS = (305419896, 591751049, 878082192)
+ZIPCRYPTO_HEADER_SIZE = 12
 
-def try_passwords(zip_binary, target_file, charset, length, prefix_group, is_found, result_holder, lock):
+# 로컬 파일 헤더: 시그니처, 버전, 플래그, 압축 방식, 수정 시간, 수정 날짜, CRC, 압축 크기, 원래 크기, 이름 길이, 추가 필드 길이
+LOCAL_HEADER = struct.Struct('<4s5H3L2H')
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+def make_crc_table():
+    """
+    ZipCrypto 키 갱신에 쓰는 CRC-32 표를 만드는 함수입니다.
+    """
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xEDB88320 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC_TABLE = make_crc_table()
+
+
+class ZipCryptoVerifier:
+    """
+    ZipCrypto로 암호화된 파일 하나의 비밀번호를 빠르게 확인하는 클래스입니다.
+    로컬 헤더는 처음 한 번만 읽고, 후보마다 12바이트 암호화 헤더만 복호화해서 확인 바이트를 비교합니다.
+    확인 바이트는 1/256 확률로 우연히 맞을 수 있으므로, 통과한 후보만 zipfile로 전체를 풀어 CRC까지 확인합니다.
+    """
+
+    def __init__(self, zip_binary, target_file):
+        self.zip_obj = zipfile.ZipFile(io.BytesIO(zip_binary))
+        self.target_file = target_file
+        info = self.zip_obj.getinfo(target_file)
+        if not info.flag_bits & 0x1:
+            raise ValueError(f'{target_file} 은(는) 암호화되어 있지 않습니다.')
+
+        offset = info.header_offset
+        (signature, _, flag_bits, _, mod_time, _, _, _, _,
+         name_length, extra_length) = LOCAL_HEADER.unpack_from(zip_binary, offset)
+        if signature != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile('로컬 파일 헤더를 찾을 수 없습니다.')
+
+        data_start = offset + LOCAL_HEADER.size + name_length + extra_length
+        self.header = zip_binary[data_start:data_start + ZIPCRYPTO_HEADER_SIZE]
+        # 데이터 디스크립터를 쓰는 파일(플래그 3번 비트)은 CRC 대신 수정 시간의 상위 바이트로 확인한다.
+        if flag_bits & 0x8:
+            self.check_byte = (mod_time >> 8) & 0xff
+        else:
+            self.check_byte = (info.CRC >> 24) & 0xff
+
+    @staticmethod
+    def password_keys(password, keys=ZIPCRYPTO_INITIAL_KEYS):
+        """
+        비밀번호 바이트로 키를 갱신한 결과를 돌려줍니다.
+        같은 접두어를 쓰는 후보들은 접두어까지의 키를 한 번만 계산해서 keys로 넘기면 됩니다.
+        """
+        key0, key1, key2 = keys
+        table = CRC_TABLE
+        for byte in password:
+            key0 = (key0 >> 8) ^ table[(key0 ^ byte) & 0xff]
+            key1 = ((key1 + (key0 & 0xff)) * 134775813 + 1) & 0xffffffff
+            key2 = (key2 >> 8) ^ table[(key2 ^ (key1 >> 24)) & 0xff]
+        return key0, key1, key2
+
+    @staticmethod
+    def update_keys(keys, byte):
+        """
+        비밀번호 한 바이트로 키를 갱신합니다. 한 자리만 바뀐 후보의 키를 이어서 계산할 때 사용합니다.
+        """
+        key0, key1, key2 = keys
+        key0 = (key0 >> 8) ^ CRC_TABLE[(key0 ^ byte) & 0xff]
+        key1 = ((key1 + (key0 & 0xff)) * 134775813 + 1) & 0xffffffff
+        key2 = (key2 >> 8) ^ CRC_TABLE[(key2 ^ (key1 >> 24)) & 0xff]
+        return key0, key1, key2
+
+    def check(self, password, keys=ZIPCRYPTO_INITIAL_KEYS):
+        """
+        암호화 헤더의 마지막 바이트가 확인 바이트와 같은지만 빠르게 봅니다.
+        """
+        return self.check_keys(self.password_keys(password, keys))
+
+    def check_keys(self, keys):
+        """
+        비밀번호까지 반영된 키로 암호화 헤더를 복호화해서 확인 바이트를 비교합니다.
+        """
+        key0, key1, key2 = keys
+        table = CRC_TABLE
+        header = self.header
+        for index in range(ZIPCRYPTO_HEADER_SIZE - 1):
+            temp = (key2 | 2) & 0xffff
+            byte = header[index] ^ (((temp * (temp ^ 1)) >> 8) & 0xff)
+            key0 = (key0 >> 8) ^ table[(key0 ^ byte) & 0xff]
+            key1 = ((key1 + (key0 & 0xff)) * 134775813 + 1) & 0xffffffff
+            key2 = (key2 >> 8) ^ table[(key2 ^ (key1 >> 24)) & 0xff]
+        temp = (key2 | 2) & 0xffff
+        return header[-1] ^ (((temp * (temp ^ 1)) >> 8) & 0xff) == self.check_byte
+
+    def verify(self, password):
+        """
+        파일 전체를 풀어서 CRC까지 맞는지 확인합니다. check를 통과한 후보에만 사용합니다.
+        틀린 비밀번호로 풀면 압축 방식에 따라 여러 종류의 예외가 나므로(bzip2는 OSError 등) 모두 실패로 봅니다.
+        """
+        try:
+            with self.zip_obj.open(self.target_file, pwd=password) as target:
+                while target.read(1 << 16):
+                    pass
+            return True
+        except Exception:
+            return False
+
+    def is_password(self, password):
+        return self.check(password) and self.verify(password)
+
+
+CHARSET = 'abcdefghijklmnopqrstuvwxyz0123456789'  # 소문자 + 숫자 조합
+
+# 한 번에 나눠 주는 구간의 크기(후보 수)
+RANGE_SIZE = 36 ** 3 * 8
+# 사전 공격에서 한 번에 나눠 주는 단어 수 (규칙을 적용하면 후보는 이보다 많아짐)
+WORD_BATCH_SIZE = 1000
+# 완료한 구간을 상태 파일에 저장하는 간격(초)
+CHECKPOINT_INTERVAL = 30
+DEFAULT_STATE_PATH = './door_hacking_state.json'
+
+# hashcat 마스크의 문자 집합 (?1 ~ ?4 는 사용자 지정)
+MASK_CHARSETS = {
+    'l': b'abcdefghijklmnopqrstuvwxyz',
+    'u': b'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'd': b'0123456789',
+    'h': b'0123456789abcdef',
+    'H': b'0123456789ABCDEF',
+    's': b' !"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~',
+}
+MASK_CHARSETS['a'] = MASK_CHARSETS['l'] + MASK_CHARSETS['u'] + MASK_CHARSETS['d'] + MASK_CHARSETS['s']
+
+
+def keyspace_digits(index, sizes):
+    """
+    키스페이스 번호(0부터 시작)를 자리별 문자 번호로 바꿉니다. 마지막 자리가 가장 빨리 바뀝니다.
+    """
+    digits = [0] * len(sizes)
+    for position in reversed(range(len(sizes))):
+        index, digits[position] = divmod(index, sizes[position])
+    return digits
+
+
+def password_at(index, alphabets):
+    """
+    키스페이스 번호를 자리별 문자 집합(alphabets)의 비밀번호(bytes)로 바꿉니다. PasswordOdometer의 순서와 같습니다.
+    """
+    digits = keyspace_digits(index, [len(alphabet) for alphabet in alphabets])
+    return bytes(alphabet[digit] for alphabet, digit in zip(alphabets, digits))
+
+
+class PasswordOdometer:
+    """
+    자리마다 쓸 수 있는 문자(alphabets)를 주행 거리계처럼 하나씩 올리며 후보를 만드는 클래스입니다.
+    후보는 하나의 bytearray(password)를 제자리에서 바꿔 쓰므로 후보마다 문자열을 새로 만들지 않습니다.
+    """
+
+    def __init__(self, alphabets, start=0):
+        self.alphabets = [bytes(alphabet) for alphabet in alphabets]
+        self.sizes = [len(alphabet) for alphabet in self.alphabets]
+        self.length = len(self.alphabets)
+        self.digits = keyspace_digits(start, self.sizes)
+        self.password = bytearray(alphabet[digit] for alphabet, digit in zip(self.alphabets, self.digits))
+
+    def advance(self):
+        """
+        다음 후보로 넘어가고, 바뀐 자리 중 가장 왼쪽 위치를 돌려줍니다. 모든 후보를 지나면 -1을 돌려줍니다.
+        """
+        digits = self.digits
+        password = self.password
+        position = self.length - 1
+        while position >= 0:
+            digit = digits[position] + 1
+            if digit < self.sizes[position]:
+                digits[position] = digit
+                password[position] = self.alphabets[position][digit]
+                return position
+            digits[position] = 0
+            password[position] = self.alphabets[position][0]
+            position -= 1
+        return -1
+
+
+def parse_mask(mask, custom_charsets=()):
+    """
+    hashcat 형식의 마스크(예: ?l?l?d?d?d?d)를 자리별 문자 집합 목록으로 바꿉니다.
+    ?l ?u ?d ?h ?H ?s ?a, 사용자 지정 ?1 ~ ?4, 그리고 ?? (물음표 자체)와 일반 문자를 쓸 수 있습니다.
+    사용자 지정 문자 집합 안에서도 ?l 같은 표기를 쓸 수 있습니다.
+    """
+    charsets = dict(MASK_CHARSETS)
+    for number, custom in enumerate(custom_charsets, start=1):
+        if custom:
+            # 중복 문자는 한 번만 남김 (같은 후보를 두 번 시도하지 않도록)
+            charsets[str(number)] = bytes(dict.fromkeys(b''.join(parse_mask(custom))))
+
+    alphabets = []
+    text = mask.encode('utf-8')
+    position = 0
+    while position < len(text):
+        char = text[position:position + 1]
+        if char == b'?':
+            name = text[position + 1:position + 2].decode('utf-8')
+            if name == '?':
+                alphabets.append(b'?')
+            elif name in charsets:
+                alphabets.append(charsets[name])
+            else:
+                raise ValueError(f'알 수 없는 마스크 문자 집합: ?{name}')
+            position += 2
+        else:
+            alphabets.append(char)
+            position += 1
+    return alphabets
+
+
+@lru_cache(maxsize=None)
+def mask_alphabets(mask):
+    """
+    규칙에 쓰는 마스크를 프로세스마다 한 번만 해석해 둡니다.
+    """
+    return tuple(parse_mask(mask))
+
+
+def iter_mask(mask):
+    """
+    규칙에 쓰는 짧은 마스크의 후보를 주행 거리계로 하나씩 만듭니다.
+    """
+    odometer = PasswordOdometer(mask_alphabets(mask))
+    yield bytes(odometer.password)
+    while odometer.advance() >= 0:
+        yield bytes(odometer.password)
+
+
+# 단어 변형 규칙 (hashcat 규칙 함수 중 일부). 공백으로 이어서 차례로 적용한다. 예: 'c $?d?d'
+# :  그대로          l  소문자        u  대문자       c  첫 글자만 대문자
+# t  대소문자 반전   r  뒤집기        d  두 번 반복
+# $마스크  뒤에 붙이기 (예: $?d?d 는 00 ~ 99)   ^마스크  앞에 붙이기
+RULE_FUNCTIONS = {
+    ':': lambda word: word,
+    'l': bytes.lower,
+    'u': bytes.upper,
+    'c': bytes.capitalize,
+    't': bytes.swapcase,
+    'r': lambda word: word[::-1],
+    'd': lambda word: word + word,
+}
+
+
+def parse_rule(rule):
+    """
+    규칙 문자열을 (함수 이름, 붙일 마스크 또는 None) 단계들로 바꿉니다.
+    마스크는 문자열 그대로 두고 작업 프로세스에서 펼치므로, 작업과 함께 후보 목록을 넘기지 않습니다.
+    """
+    steps = []
+    for token in rule.split():
+        if token[0] in '$^':
+            mask_alphabets(token[1:])  # 잘못된 마스크는 시작할 때 알려 줌
+            steps.append((token[0], token[1:]))
+        elif token in RULE_FUNCTIONS:
+            steps.append((token, None))
+        else:
+            raise ValueError(f'알 수 없는 규칙: {token}')
+    return steps
+
+
+def apply_rule(word, steps):
+    """
+    단어 하나에 규칙을 적용한 후보를 하나씩 만듭니다.
+    붙일 문자열도 필요할 때 마스크에서 만들므로 규칙이 길어도 후보 목록을 메모리에 쌓지 않습니다.
+    """
+    if not steps:
+        yield word
+        return
+    (name, mask), rest = steps[0], steps[1:]
+    if name == '$':
+        for affix in iter_mask(mask):
+            yield from apply_rule(word + affix, rest)
+    elif name == '^':
+        for affix in iter_mask(mask):
+            yield from apply_rule(affix + word, rest)
+    else:
+        yield from apply_rule(RULE_FUNCTIONS[name](word), rest)
+
+
+class MaskAttack:
+    """
+    마스크 공격 단계입니다. 전체 탐색도 ?1?1?1?1?1?1 (?1 = CHARSET) 마스크로 표현합니다.
+    """
+
+    def __init__(self, mask, custom_charsets=()):
+        self.mask = mask
+        self.custom_charsets = tuple(custom_charsets)
+        self.alphabets = parse_mask(mask, custom_charsets)
+        self.size = 1
+        for alphabet in self.alphabets:
+            self.size *= len(alphabet)
+        self.key = f'mask:{mask}:{",".join(charset or "" for charset in self.custom_charsets)}'
+
+    def tasks(self):
+        """
+        키스페이스를 작은 구간 (시작, 끝, None) 들로 나눕니다.
+        """
+        for start in range(0, self.size, RANGE_SIZE):
+            yield start, min(start + RANGE_SIZE, self.size), None
+
+    def try_task(self, verifier, start, end, words, is_found):
+        return try_password_range(verifier, self.alphabets, start, end, is_found)
+
+
+class WordlistAttack:
+    """
+    사전 공격 단계입니다. 단어 파일을 조금씩 읽어서 (시작 번호, 끝 번호, 단어 목록) 으로 나눠 주고,
+    작업 프로세스가 각 단어에 규칙을 적용해 확인합니다.
+    """
+
+    def __init__(self, path, rules=(':',)):
+        self.path = path
+        self.rules = tuple(rules)
+        self.steps = [parse_rule(rule) for rule in self.rules]
+        self.key = f'wordlist:{os.path.abspath(path)}:{"|".join(self.rules)}'
+
+    def tasks(self):
+        with open(self.path, 'rb') as f:
+            words = []
+            start = 0
+            for line in f:
+                word = line.rstrip(b'\r\n')
+                if word:
+                    words.append(word)
+                if len(words) == WORD_BATCH_SIZE:
+                    yield start, start + len(words), words
+                    start += len(words)
+                    words = []
+            if words:
+                yield start, start + len(words), words
+
+    def try_task(self, verifier, start, end, words, is_found):
+        return try_words(verifier, words, self.steps, is_found)
+
+
+def brute_force_attacks(min_length, max_length, charset=CHARSET):
+    """
+    길이 범위의 전체 탐색을 짧은 길이부터 차례로 마스크 공격 단계로 만듭니다.
     """
-    각 프로세스에서 비밀번호 조합을 시도해보는 함수입니다.
-    prefix_group에 해당하는 접두어들만 담당하며, 멀티프로세싱 환경에서 작동합니다.
+    return [MaskAttack('?1' * length, (charset,)) for length in range(min_length, max_length + 1)]
+
+
+class SearchCheckpoint:
+    """
+    끝까지 확인한 구간을 단계별로 상태 파일에 저장하고, 다시 시작할 때 건너뛸 수 있게 해주는 클래스입니다.
+    같은 zip, 파일, 공격 단계, 나눠 맡은 부분일 때만 이어서 할 수 있습니다.
     """
-    zip_data = io.BytesIO(zip_binary)
-    zip_obj = zipfile.ZipFile(zip_data)
+
+    def __init__(self, path, zip_path, target_file, attacks, part):
+        self.path = path
+        self.settings = {
+            'zip_path': os.path.abspath(zip_path),
+            'target_file': target_file,
+            'attacks': [attack.key for attack in attacks],
+            'part': list(part) if part else None,
+        }
+        self.completed = {attack.key: [] for attack in attacks}
+        self.password = None
+        self.last_saved = time.time()
+
+    def load(self):
+        """
+        상태 파일을 읽어 완료 구간을 복원합니다. 파일이 없으면 처음부터 시작합니다.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        for key, value in self.settings.items():
+            if state.get(key) != value:
+                raise ValueError(f'상태 파일의 {key} 값이 다릅니다: {state.get(key)!r} != {value!r}')
+        self.completed = {key: [tuple(done) for done in ranges] for key, ranges in state['completed'].items()}
+        self.password = state.get('password')
+
+    def add(self, key, start, end):
+        """
+        완료한 구간을 추가하고 이어지는 구간끼리 합칩니다.
+        """
+        merged = []
+        for done_start, done_end in sorted(self.completed[key] + [(start, end)]):
+            if merged and done_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], done_end))
+            else:
+                merged.append((done_start, done_end))
+        self.completed[key] = merged
+
+    def is_done(self, key, start, end):
+        return any(done_start <= start and end <= done_end for done_start, done_end in self.completed[key])
+
+    def completed_count(self):
+        return sum(done_end - done_start for ranges in self.completed.values() for done_start, done_end in ranges)
+
+    def save(self, force=False):
+        """
+        CHECKPOINT_INTERVAL초마다(force면 바로) 상태 파일을 씁니다. 쓰다가 멈춰도 깨지지 않도록 임시 파일을 바꿔치기합니다.
+        """
+        if not force and time.time() - self.last_saved < CHECKPOINT_INTERVAL:
+            return
+        state = dict(self.settings, completed=self.completed, password=self.password)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self.last_saved = time.time()
+
+
+def try_password_range(verifier, alphabets, start, end, is_found):
+    """
+    [start, end) 구간의 후보를 확인합니다. 찾으면 비밀번호(bytes)를, 아니면 None을 돌려주고 시도 횟수도 함께 돌려줍니다.
+    자리마다 그 자리까지 반영한 키를 keys에 보관해 두고, 주행 거리계에서 바뀐 자리부터만 키를 다시 계산합니다.
+    (대부분의 후보는 마지막 한 자리만 바뀌므로 비밀번호 한 바이트 + 암호화 헤더만 계산하면 됩니다.)
+    """
+    odometer = PasswordOdometer(alphabets, start)
+    password = odometer.password
+    length = odometer.length
+    update_keys = verifier.update_keys
+    check_keys = verifier.check_keys
+
+    keys = [ZIPCRYPTO_INITIAL_KEYS] * (length + 1)
+    for position in range(length):
+        keys[position + 1] = update_keys(keys[position], password[position])
+
+    for index in range(start, end):
+        if check_keys(keys[length]):
+            # 암호화 헤더의 확인 바이트가 맞는 후보(약 1/256)만 전체를 풀어서 CRC까지 확인
+            if verifier.verify(bytes(password)):
+                return bytes(password), index - start + 1
+        if not index & 0xffff and is_found.value:
+            return None, index - start  # 다른 프로세스에서 이미 찾았으면 중단
+
+        changed = odometer.advance()
+        if changed < 0:
+            break  # 키스페이스의 마지막 후보
+        for position in range(changed, length):
+            keys[position + 1] = update_keys(keys[position], password[position])
+    return None, end - start
+
+
+def try_words(verifier, words, rule_steps, is_found):
+    """
+    단어마다 모든 규칙을 적용한 후보를 확인합니다. 반환 값은 try_password_range와 같습니다.
+    """
+    attempts = 0
+    for word in words:
+        for steps in rule_steps:
+            for candidate in apply_rule(word, steps):
+                if not attempts & 0xffff and is_found.value:
+                    return None, attempts  # 다른 프로세스에서 이미 찾았으면 중단
+                attempts += 1
+                if verifier.check(candidate) and verifier.verify(candidate):
+                    return candidate, attempts
+    return None, attempts
+
+
+def search_worker(zip_binary, target_file, attacks, task_queue, report_queue, is_found, lock):
+    """
+    공유 큐에서 작업 (단계 번호, 시작, 끝, 단어 목록) 을 하나씩 가져와 확인하는 작업 프로세스입니다.
+    먼저 끝난 프로세스가 다음 작업을 바로 가져가므로 비밀번호를 찾을 때까지 모든 코어가 쉬지 않습니다.
+    끝까지 확인한 구간은 report_queue로 알려서 메인 프로세스가 상태 파일에 기록합니다.
+    """
+    # Ctrl-C는 메인 프로세스가 받아서 상태를 저장한 뒤 작업 프로세스를 정리한다.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    verifier = ZipCryptoVerifier(zip_binary, target_file)
+    name = current_process().name
     start_time = time.time()
     attempts = 0
+    ranges_done = 0
 
-    for prefix in prefix_group:
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break  # 더 이상 작업이 없음
         if is_found.value:
-            return  # 다른 프로세스에서 이미 찾았으면 종료
+            continue  # 이미 찾았으면 남은 작업은 건너뛰고 종료 신호까지 비움
 
-        # prefix 이후 뒷자리를 조합해서 전체 비밀번호 구성
-        for tail in product(charset, repeat=length - 1):
-            if is_found.value:
-                return  # 중간에라도 다른 프로세스가 찾았으면 바로 중단
+        stage, start, end, words = task
+        password, task_attempts = attacks[stage].try_task(verifier, start, end, words, is_found)
+        attempts += task_attempts
+        ranges_done += 1
 
-            password = prefix + ''.join(tail)
-            attempts += 1
+        if password:
+            with lock:
+                # 다시 확인한 후 비밀번호 보고
+                if not is_found.value:
+                    is_found.value = True
+                    report_queue.put(('found', password))
+                    elapsed = time.time() - start_time
+                    print(f'\n✅ [성공] [{name}] 비밀번호: {password.decode("utf-8", "replace")}')
+                    print(f'⏱️ 경과 시간: {elapsed:.2f}초')
+        elif not is_found.value:
+            # 중간에 멈추지 않고 끝까지 확인한 구간만 완료로 보고
+            report_queue.put(('done', (stage, start, end)))
+            if ranges_done % 10 == 0:
+                # 진행 상황 출력 (10구간마다)
+                elapsed = time.time() - start_time
+                print(f'[{name}] {ranges_done}구간, {attempts}회 시도 중... {elapsed:.1f}s 경과')
 
-            try:
-                # 전체 압축을 푸는 대신, 파일 일부만 읽어서 비밀번호 확인
-                data = zip_obj.open(target_file, pwd=password.encode('utf-8')).read(1)
-                if data:
-                    with lock:
-                        # 다시 확인한 후 비밀번호 저장
-                        if not is_found.value:
-                            is_found.value = True
-                            result_holder.value = password.encode('utf-8')
-                            elapsed = time.time() - start_time
-                            print(f'\n✅ [성공] 비밀번호: {password}')
-                            print(f'⏱️ 경과 시간: {elapsed:.2f}초')
-                    return
-            except (RuntimeError, zipfile.BadZipFile, zlib.error):
-                # 비밀번호가 틀렸거나 압축이 깨졌을 경우 그냥 넘어감
-                pass
+    report_queue.put(('stats', (name, ranges_done, attempts, time.time() - start_time)))
 
-            # 진행 상황 출력 (10만 회마다)
-            if attempts % 100000 == 0:
-                elapsed = time.time() - start_time
-                print(f'[{current_process().name}] {attempts}회 시도 중... {elapsed:.1f}s 경과')
 
+class WorkerExitedError(RuntimeError):
+    """
+    작업 프로세스가 처리량을 보고하지 않고 종료되었을 때 메인 프로세스가 기다리기를 멈추는 데 쓰는 예외입니다.
+    """
 
-def unlock_zip_password(zip_path: str, length: int = 6, process_count: int = 4) -> str | None:
+
+def print_worker_stats(stats):
+    """
+    프로세스별 처리량과 전체 처리량을 출력합니다.
+    """
+    total_attempts = 0
+    for name, ranges_done, attempts, elapsed in sorted(stats):
+        total_attempts += attempts
+        rate = attempts / elapsed if elapsed else 0
+        print(f'[{name}] {ranges_done}구간, {attempts:,}회, 초당 {rate:,.0f}회')
+    elapsed = max((stat[3] for stat in stats), default=0)
+    if elapsed:
+        print(f'[전체] {total_attempts:,}회, 초당 {total_attempts / elapsed:,.0f}회')
+
+
+def handle_reports(report_queue, checkpoint, attacks, stats, timeout=None):
+    """
+    작업 프로세스의 보고를 처리합니다. timeout이 None이면 쌓여 있는 것만 처리하고, 아니면 하나가 올 때까지 기다립니다.
+    """
+    while True:
+        try:
+            kind, payload = report_queue.get(timeout=timeout) if timeout else report_queue.get_nowait()
+        except queue.Empty:
+            return
+        if kind == 'done':
+            stage, start, end = payload
+            checkpoint.add(attacks[stage].key, start, end)
+        elif kind == 'found':
+            checkpoint.password = payload.decode('utf-8', 'replace')
+        else:
+            stats.append(payload)
+        if timeout:
+            return
+
+
+def iter_tasks(attacks, checkpoint, part=None):
     """
-    여러 프로세스를 사용해 ZIP 파일의 비밀번호를 브루트포스로 찾아내는 함수입니다.
+    단계 순서대로(가능성이 높은 후보부터) 작업을 만듭니다. 이미 끝난 구간은 건너뜁니다.
+    part=(k, n)이면 각 단계의 작업을 번갈아 n개로 나눈 중 k번째(1부터)만 만듭니다.
     """
-    charset = 'abcdefghijklmnopqrstuvwxyz0123456789'  # 소문자 + 숫자 조합
+    for stage, attack in enumerate(attacks):
+        for number, (start, end, words) in enumerate(attack.tasks()):
+            if part and number % part[1] != part[0] - 1:
+                continue
+            if not checkpoint.is_done(attack.key, start, end):
+                yield stage, start, end, words
+
+
+def unlock_zip_password(zip_path: str, length: int = 6, process_count: int = 4,
+                        state_path: str = DEFAULT_STATE_PATH, resume: bool = False,
+                        part: tuple[int, int] | None = None, attacks: list | None = None,
+                        overwrite: bool = False) -> str | None:
+    """
+    여러 프로세스를 사용해 ZIP 파일의 비밀번호를 찾아내는 함수입니다.
+    attacks(사전, 마스크 공격 단계 목록)를 차례로 시도하며, 주지 않으면 length자리 전체 탐색을 합니다.
+    완료한 구간은 state_path에 주기적으로 저장하고, resume이면 저장된 구간을 건너뜁니다.
+    state_path가 이미 있는데 resume도 overwrite도 아니면, 기록된 진행 상황을 덮어쓰지 않도록 시작하지 않습니다.
+    part=(k, n)이면 여러 대로 나눠 찾을 때 이 컴퓨터가 맡은 k번째 부분만 찾습니다.
+    """
+    attacks = attacks or brute_force_attacks(length, length)
+    if part and not 1 <= part[0] <= part[1]:
+        print(f'❌ part는 1 ~ {part[1]} 사이여야 합니다: {part[0]}')
+        return None
 
     # zip 파일 전체를 메모리에 올려서 빠르게 접근할 수 있도록 처리
     with open(zip_path, 'rb') as f:
@@ -66,48 +598,161 @@ def unlock_zip_password(zip_path: str, length: int = 6, process_count: int = 4)
     zip_file = zipfile.ZipFile(io.BytesIO(zip_bytes))
     file_to_test = zip_file.namelist()[0]
 
-    # 접두어를 나눠서 각 프로세스가 맡을 부분 정함
-    prefixes = list(charset)
-    step = len(prefixes) // process_count
-    chunks = [prefixes[i * step: (i + 1) * step] for i in range(process_count - 1)]
-    chunks.append(prefixes[(process_count - 1) * step:])  # 마지막은 남은 문자 전부
+    # 작업 프로세스를 만들기 전에 확인해서, 암호화되지 않은 파일이면 바로 알려 주고 끝냄
+    try:
+        ZipCryptoVerifier(zip_bytes, file_to_test)
+    except (ValueError, zipfile.BadZipFile) as error:
+        print(f'❌ {error}')
+        return None
+
+    checkpoint = SearchCheckpoint(state_path, zip_path, file_to_test, attacks, part)
+    if resume:
+        try:
+            checkpoint.load()
+        except ValueError as error:
+            print(f'❌ {error}')
+            return None
+        if checkpoint.password:
+            print(f'✅ 이전 실행에서 찾은 비밀번호: {checkpoint.password}')
+            return checkpoint.password
+        print(f'이어서 찾기: {checkpoint.completed_count():,}개 완료')
+    elif os.path.exists(state_path) and not overwrite:
+        print(f'❌ 상태 파일 {state_path} 이(가) 이미 있습니다. '
+              f'이어서 하려면 --resume, 처음부터 다시 하려면 --overwrite-state 를 지정하세요.')
+        return None
 
-    # 공통 데이터 구조 (공유 변수, 락)
-    is_found = Value('b', False)          # 비밀번호를 찾았는지 여부
-    result_holder = Array('c', 7)         # 비밀번호 저장용 배열 (최대 6자리 + null)
-    lock = Lock()                         # 동기화용 락
+    # 공통 데이터 구조 (공유 변수, 락, 큐)
+    is_found = Value('b', False)              # 비밀번호를 찾았는지 여부
+    lock = Lock()                             # 동기화용 락
+    task_queue = Queue(maxsize=process_count * 4)  # 작업 큐 (필요할 때마다 채움)
+    report_queue = Queue()                    # 찾은 비밀번호, 완료 구간, 프로세스별 처리량
+    stats = []
 
     # 각 프로세스 실행
     processes = []
     for i in range(process_count):
         p = Process(
-            target=try_passwords,
-            args=(zip_bytes, file_to_test, charset, length, chunks[i], is_found, result_holder, lock),
+            target=search_worker,
+            args=(zip_bytes, file_to_test, attacks, task_queue, report_queue, is_found, lock),
             name=f"P{i + 1}"
         )
         processes.append(p)
         p.start()
 
-    # 모든 프로세스가 종료될 때까지 대기
-    for p in processes:
-        p.join()
+    def check_workers():
+        # 처리량을 보고하지 않고 종료된 프로세스가 있으면 더 기다리지 않고 중단
+        # (종료를 먼저 확인한 뒤 보고를 받아야, 보고하고 정상 종료한 프로세스를 잘못 세지 않음)
+        exited = [p for p in processes if not p.is_alive()]
+        handle_reports(report_queue, checkpoint, attacks, stats)
+        reported = {stat[0] for stat in stats}
+        lost = [f'{p.name}(exitcode={p.exitcode})' for p in exited if p.name not in reported]
+        if lost:
+            raise WorkerExitedError(f'작업 프로세스가 비정상 종료되었습니다: {", ".join(lost)}')
+
+    def stop_workers():
+        for p in processes:
+            p.terminate()
+        handle_reports(report_queue, checkpoint, attacks, stats)
+        checkpoint.save(force=True)
+
+    def put_task(task):
+        # 큐가 가득 차 있는 동안에도 완료 보고를 받아서 상태 파일을 갱신
+        while True:
+            check_workers()
+            checkpoint.save()
+            try:
+                task_queue.put(task, timeout=0.5)
+                return
+            except queue.Full:
+                pass
+
+    try:
+        # 작업을 작은 단위로 큐에 넣고, 찾으면 더 넣지 않음 (단어 파일도 필요한 만큼만 읽음)
+        for task in iter_tasks(attacks, checkpoint, part):
+            if is_found.value:
+                break
+            put_task(task)
+        for _ in processes:
+            put_task(None)
+
+        # 처리량을 모두 받은 뒤 모든 프로세스가 종료될 때까지 대기
+        while len(stats) < process_count:
+            handle_reports(report_queue, checkpoint, attacks, stats, timeout=0.5)
+            check_workers()
+            checkpoint.save()
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        # 진행 중이던 구간은 버리고, 끝난 구간까지만 저장한 뒤 종료
+        stop_workers()
+        print(f'\n⏸️ 중단되었습니다. {checkpoint.completed_count():,}개 확인 완료, --resume 으로 이어서 할 수 있습니다.')
+        return None
+    except WorkerExitedError as error:
+        stop_workers()
+        print(f'\n❌ {error}')
+        print(f'{checkpoint.completed_count():,}개 확인 완료, --resume 으로 이어서 할 수 있습니다.')
+        return None
+
+    print_worker_stats(stats)
+    checkpoint.save(force=True)
 
     # 결과 반환
-    if is_found.value:
-        return result_holder.value.decode('utf-8')
+    if checkpoint.password:
+        return checkpoint.password
     else:
         print('❌ 비밀번호를 찾지 못했습니다.')
         return None
 
 
+def parse_part(text):
+    part, part_count = text.split('/')
+    return int(part), int(part_count)
+
+
+def parse_length(text):
+    """
+    '6' 또는 '4-6' 형식의 길이 범위를 (최소, 최대)로 바꿉니다.
+    """
+    low, _, high = text.partition('-')
+    return int(low), int(high or low)
+
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='ZIP 파일 비밀번호를 찾습니다. 사전 → 마스크 → 전체 탐색 순서로, 가능성이 높은 후보부터 시도합니다.')
     # ZIP 파일 경로 설정 (과제 기준 파일명)
-    zip_path = './emergency_storage_key.zip'
-
+    parser.add_argument('zip_path', nargs='?', default='./emergency_storage_key.zip')
+    parser.add_argument('--wordlist', help='한 줄에 단어 하나씩 있는 사전 파일')
+    parser.add_argument('--rule', action='append', help="단어 변형 규칙, 여러 번 지정 가능 (예: ':', 'c', 'c $?d?d')")
+    parser.add_argument('--mask', action='append', help='hashcat 형식 마스크, 여러 번 지정 가능 (예: ?l?l?d?d?d?d)')
+    for number in range(1, 5):
+        parser.add_argument(f'-{number}', f'--custom-charset{number}', default=CHARSET if number == 1 else None,
+                            help=f'마스크의 ?{number} 문자 집합' + (' (기본값: 소문자 + 숫자)' if number == 1 else ''))
+    parser.add_argument('--length', type=parse_length, help='전체 탐색 길이, 범위 가능 (예: 6, 4-6). ?1 문자 집합 사용')
     # CPU 코어 수에 따라 병렬 프로세스 수 결정
-    password = unlock_zip_password(zip_path, process_count=os.cpu_count() or 4)
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help='완료한 구간을 저장할 상태 파일')
+    parser.add_argument('--resume', action='store_true', help='상태 파일에 저장된 구간은 건너뛰고 이어서 찾기')
+    parser.add_argument('--overwrite-state', action='store_true', help='상태 파일이 이미 있어도 처음부터 다시 찾기')
+    parser.add_argument('--part', type=parse_part, help='여러 대로 나눠 찾을 때 이 컴퓨터가 맡을 부분 (예: 2/4)')
+    args = parser.parse_args()
+
+    custom_charsets = (args.custom_charset1, args.custom_charset2, args.custom_charset3, args.custom_charset4)
+    attacks = []
+    if args.wordlist:
+        attacks.append(WordlistAttack(args.wordlist, args.rule or [':']))
+    for mask in args.mask or []:
+        attacks.append(MaskAttack(mask, custom_charsets))
+    # 아무 공격도 지정하지 않으면 과제 기준인 6자리 전체 탐색
+    if args.length or not attacks:
+        min_length, max_length = args.length or (6, 6)
+        attacks.extend(brute_force_attacks(min_length, max_length, args.custom_charset1))
+
+    password = unlock_zip_password(args.zip_path, process_count=args.processes, state_path=args.state,
+                                   resume=args.resume, part=args.part, attacks=attacks,
+                                   overwrite=args.overwrite_state)
 
     if password:
         # 찾은 비밀번호를 파일로 저장
         with open('password.txt', 'w') as f:
-            f.write(password)
\ No newline at end of file
+            f.write(password)
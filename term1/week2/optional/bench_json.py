@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+# 벤치마크용 레코드 수
+RECORD_COUNT = 200000
+
+encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+# 기존 save_json_sections 방식: 문자열 하나에 반복해서 이어 붙인 뒤 한 번에 쓴다.
+def write_json_by_concat(content: dict, path: str):
+    json_content = '{\n'
+    for key, value in content.items():
+        key = str(key).replace("'", "\\'")
+        if isinstance(value, list):
+            value = '[' + ', '.join(["'" + str(item).replace("'", "\\'") + "'" for item in value]) + ']'
+        else:
+            value = "'" + str(value).replace("'", "\\'") + "'"
+        json_content += f"    '{key}': {value},\n"
+    json_content = json_content.rstrip(',\n') + '\n}'
+
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(json_content)
+
+
+# 새 save_json_sections 방식: 항목마다 인코딩해서 바로 쓴다.
+def write_json_streaming(content: dict, path: str):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('{')
+        separator = '\n'
+        for key, value in content.items():
+            file.write(f'{separator}    {encode_json(str(key))}: {encode_json(value)}')
+            separator = ',\n'
+        file.write('\n}\n')
+
+
+# 새 save_jsonl_sections 방식: 한 줄에 레코드 하나
+def write_jsonl(content: dict, path: str):
+    with open(path, 'w', encoding='utf-8') as file:
+        for key, value in content.items():
+            file.write(f'{{{encode_json(str(key))}: {encode_json(value)}}}\n')
+
+
+def measure_peak_memory(write, content: dict, path: str) -> int:
+    tracemalloc.start()
+    write(content, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    content = {f'2023-08-27 {i:08d}': ['INFO', f"Sensor '{i}' reading nominal."] for i in range(RECORD_COUNT)}
+
+    print(f'레코드 수: {RECORD_COUNT}')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, write, file_name in [
+            ('기존 방식 (문자열 이어 붙이기)', write_json_by_concat, 'concat.json'),
+            ('JSON 스트리밍 쓰기', write_json_streaming, 'stream.json'),
+            ('JSON Lines 스트리밍', write_jsonl, 'records.jsonl'),
+        ]:
+            # tracemalloc 을 켜면 느려지므로 시간은 따로 측정한다.
+            start = time.perf_counter()
+            write(content, os.path.join(tmp_dir, file_name))
+            elapsed = time.perf_counter() - start
+            peak = measure_peak_memory(write, content, os.path.join(tmp_dir, file_name))
+            print(f'{name}: {elapsed:.3f}초, 최대 추가 메모리 {peak / 1024 / 1024:.1f} MB')
@@ -1,3 +1,9 @@
+import json
+
+TIMESTAMP_SEPARATORS = str.maketrans('', '', '- :')
+# json.dumps 는 호출마다 인코더를 새로 만들기 때문에 하나를 만들어 두고 재사용한다.
+encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
 def write_error_log(message: str, fileName: str):
     try:
         with open(f'{fileName}.log', 'a', encoding='utf-8') as file:
@@ -30,47 +36,148 @@ def convert_to_list(content: str) -> list:
     
     return data
 
-def save_json_sections(fileName: str, content: dict):
+# 'YYYY-MM-DD HH:MM:SS' 형식의 시간을 YYYYMMDDHHMMSS 정수로 한 번만 변환한다.
+def timestamp_key(timestamp: str) -> int:
+    try:
+        return int(timestamp.translate(TIMESTAMP_SEPARATORS))
+    except ValueError:
+        return -1
+
+# 헤더는 맨 앞에 두고, 나머지 행을 시간의 역순으로 정렬한다.
+# 정렬 키는 행마다 한 번만 정수로 변환해 두고 비교에 그대로 사용한다.
+def sort_rows_by_timestamp(rows: list) -> list:
+    if not rows:
+        return []
+
+    header, data = rows[0], rows[1:]
+    return [header] + sorted(data, key=lambda row: timestamp_key(row[0]), reverse=True)
+
+def confirm_overwrite(fileName: str) -> bool:
     try:
-        with open(f'{fileName}.json', 'r', encoding='utf-8'):
+        with open(fileName, 'r', encoding='utf-8'):
             choice = input(f'{fileName} 파일이 이미 존재합니다. 덮어쓸까요? (y/n): ').strip().lower()
             if choice != 'y':
                 print('저장을 취소했습니다.')
-                return
+                return False
     except FileNotFoundError:
         print(f'파일을 찾을 수 없습니다: {fileName}')
         pass
+    return True
+
+# 키와 값은 json 모듈로 인코딩해서 올바른 JSON 을 만들고, 항목마다 한 줄씩 바로 파일에 쓴다.
+# 전체 내용을 하나의 문자열로 만들지 않으므로 사전이 커도 메모리를 더 쓰지 않는다.
+def save_json_sections(fileName: str, content: dict):
+    if not confirm_overwrite(f'{fileName}.json'):
+        return
 
     try:
-        json_content = '{\n'
-        for key, value in content.items():
-            key = str(key).replace('\'', '\\\'')
-            if isinstance(value, list):
-                value = '[' + ', '.join([f'\'{str(item).replace('\'', '\\\'')}\'' for item in value]) + ']'
-            else:
-                value = f'\'{str(value).replace('\'', '\\\'')}\''
-            json_content += f'    '{key}': {value},\n'
-
-        json_content = json_content.rstrip(',\n') + '\n}'
-        
         with open(f'{fileName}.json', 'w', encoding='utf-8') as file:
-            file.write(json_content)
+            file.write('{')
+            separator = '\n'
+            for key, value in content.items():
+                file.write(f'{separator}    {encode_json(str(key))}: {encode_json(value)}')
+                separator = ',\n'
+            file.write('\n}\n')
         
-        print(f'{fileName} 파일을 저장했습니다.')
+        print(f'{fileName}.json 파일을 저장했습니다.')
     except Exception as e:
         print(f'파일 저장 중 오류가 발생했습니다: {e}')
 
-def search_for_key_value(content: dict):
-    search_string = input('검색할 문자열을 입력하세요: ').strip()
+# JSON Lines 형식으로 한 줄에 하나의 {key: value} 레코드를 쓴다.
+# records 는 (key, value) 쌍을 만들어 내는 어떤 iterable 이든 되므로, 생성되는 대로 바로 기록된다.
+def save_jsonl_sections(fileName: str, records) -> int:
+    if not confirm_overwrite(f'{fileName}.jsonl'):
+        return 0
 
-    found = False
-    for key, value in content.items():
-        if search_string.lower() in str(key).lower() or any(search_string.lower() in str(v).lower() for v in value):
+    count = 0
+    try:
+        with open(f'{fileName}.jsonl', 'w', encoding='utf-8') as file:
+            for key, value in records:
+                file.write(f'{{{encode_json(str(key))}: {encode_json(value)}}}\n')
+                count += 1
+
+        print(f'{fileName}.jsonl 파일에 {count}개의 레코드를 저장했습니다.')
+    except Exception as e:
+        print(f'파일 저장 중 오류가 발생했습니다: {e}')
+    return count
+
+# 사전 객체를 한 번만 훑어서 만드는 검색용 n-gram 인덱스: 길이 n 조각 -> 항목 번호 집합
+# 검색은 부분 문자열 기준이므로 조각으로 후보 항목을 추린다.
+# 후보 항목만 실제 문자열과 비교하고, 같은 검색어는 캐시에서 바로 돌려준다.
+class KeyValueIndex:
+    def __init__(self, content: dict, ngram_size: int = 3, cache_size: int = 1024):
+        self.ngram_size = ngram_size
+        self.cache_size = cache_size
+        self.items = list(content.items())
+        self.fields = []
+        self.ngram_index = {}
+        self.cache = {}
+
+        for item_id, (key, value) in enumerate(self.items):
+            values = value if isinstance(value, (list, tuple)) else [value]
+            fields = [str(key).lower()] + [str(v).lower() for v in values]
+            self.fields.append(fields)
+
+            for field in fields:
+                for gram in self.ngrams(field):
+                    self.ngram_index.setdefault(gram, set()).add(item_id)
+
+    def ngrams(self, text: str) -> set:
+        # n 보다 짧은 필드는 필드 전체를 하나의 조각으로 등록해서 짧은 값도 찾을 수 있게 한다.
+        if len(text) < self.ngram_size:
+            return {text} if text else set()
+        return {text[i:i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
+
+    def candidates(self, query: str) -> set:
+        if len(query) >= self.ngram_size:
+            postings = [self.ngram_index.get(gram) for gram in self.ngrams(query)]
+            if not all(postings):
+                return set()
+            postings.sort(key=len)
+            return set.intersection(*postings)
+
+        # n 보다 짧은 검색어는 그 검색어를 포함하는 조각들의 항목을 모두 모은다.
+        result = set()
+        for gram, item_ids in self.ngram_index.items():
+            if query in gram:
+                result |= item_ids
+        return result
+
+    def remember(self, query: str, result: list) -> list:
+        if len(self.cache) >= self.cache_size:
+            self.cache.pop(next(iter(self.cache)))
+        self.cache[query] = result
+        return result
+
+    # 키나 값 중 하나라도 검색어를 포함하는 항목 (대소문자 무시, 원래 선형 검색과 같은 결과)
+    def search(self, query: str) -> list:
+        query = query.lower()
+        if query in self.cache:
+            return self.cache[query]
+        if not query:
+            return self.remember(query, list(self.items))
+
+        matched = [item_id for item_id in self.candidates(query)
+                   if any(query in field for field in self.fields[item_id])]
+        matched.sort()
+        return self.remember(query, [self.items[item_id] for item_id in matched])
+
+def search_for_key_value(content: dict, index: KeyValueIndex = None):
+    # 인덱스는 한 번만 만들고, 빈 문자열을 입력할 때까지 반복해서 검색한다.
+    if index is None:
+        index = KeyValueIndex(content)
+
+    while True:
+        search_string = input('검색할 문자열을 입력하세요 (종료: Enter): ').strip()
+        if not search_string:
+            break
+
+        found = index.search(search_string)
+        for key, value in found:
             print(f'찾은 항목: {key}: {value}')
-            found = True
 
-    if not found:
-        print(f''{search_string}'에 해당하는 항목을 찾을 수 없습니다.')
+        if not found:
+            print(f"'{search_string}'에 해당하는 항목을 찾을 수 없습니다.")
 
 file_content = read_file('mission_computer_main.log')
 
@@ -85,10 +192,10 @@ if file_content:
     print(list_file_content)
 
     # 리스트 객체를 시간의 역순으로 정렬(sort)한다. 
-    sorted_list_file_content = sorted(list_file_content, key=lambda x: x[0], reverse=True)
+    sorted_list_file_content = sort_rows_by_timestamp(list_file_content)
 
-    # 리스트 객체를 사전(Dict) 객체로 전환한다. 
-    sorted_dict_file_content = {row[0]: row[1:] for row in sorted(sorted_list_file_content, key=lambda x: x[0], reverse=True)}
+    # 리스트 객체를 사전(Dict) 객체로 전환한다. 이미 정렬된 순서를 그대로 사용한다.
+    sorted_dict_file_content = {row[0]: row[1:] for row in sorted_list_file_content}
 
     print(sorted_dict_file_content)
 
@@ -0,0 +1,46 @@
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from main import ErrorLogWriter
+
+# 벤치마크용 ERROR 줄 수
+LINE_COUNT = 100000
+
+
+# 기존 write_error_log 방식: 줄마다 파일을 열고 닫으며 메시지를 출력한다.
+def write_error_log_per_line(message: str, fileName: str):
+    with open(f'{fileName}.log', 'a', encoding='utf-8') as file:
+        file.write(f'{message}\n')
+        print(f'{fileName}.log 파일을 저장했습니다.')
+
+
+def bench_per_line(lines: list, fileName: str) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for line in lines:
+            write_error_log_per_line(line, fileName)
+    return time.perf_counter() - start
+
+
+def bench_buffered(lines: list, fileName: str) -> float:
+    start = time.perf_counter()
+    with ErrorLogWriter(fileName, quiet=True) as writer:
+        for line in lines:
+            writer.write(line)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    lines = [f'2023-08-27 10:{i % 60:02d}:00,ERROR,Sensor failure #{i}' for i in range(LINE_COUNT)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        per_line = bench_per_line(lines, os.path.join(tmp_dir, 'per_line'))
+        buffered = bench_buffered(lines, os.path.join(tmp_dir, 'buffered'))
+
+    print(f'ERROR 줄 수: {LINE_COUNT}')
+    print(f'기존 방식 (줄마다 open/close): {per_line:.3f}초')
+    print(f'ErrorLogWriter (버퍼링):       {buffered:.3f}초')
+    print(f'속도 향상: {per_line / buffered:.1f}배')
@@ -1,26 +1,119 @@
-def save_error_log(content: str):
-    lines = content.strip().split('\n')
-    data = [line.split(',') for line in lines[1:]]
+import atexit
+import heapq
+import os
+import tempfile
+import threading
+import time
 
-    for row in data:
-        if row[1] == 'ERROR':
-            write_error_log(','.join(row), 'error') 
+# 외부 정렬 시 한 번에 메모리에 올릴 로그 크기 (바이트)
+SORT_MEMORY_BUDGET = 64 * 1024 * 1024
+TIMESTAMP_SEPARATORS = str.maketrans('', '', '- :')
+
+# 로그 파일을 한 줄씩 읽어서 [timestamp, event, message] 로 한 번만 파싱한다.
+# 파일 객체나 줄 목록 어느 쪽이든 받을 수 있고, 전체 내용을 메모리에 올리지 않는다.
+def iter_log_rows(lines):
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield line.split(',', 2)
+
+# 로그 파일 핸들을 한 번만 열어 두고 줄 단위 메시지를 버퍼에 모았다가 한꺼번에 기록한다.
+# 버퍼 크기(buffer_size 바이트)나 시간(flush_interval 초)을 넘기면 flush 하고,
+# close() 나 프로그램 종료 시에도 남은 내용을 기록한다. quiet=True 이면 저장 메시지를 출력하지 않는다.
+# 버퍼에 남은 내용이 있으면 타이머로 flush_interval 초 뒤에 기록하므로, 더 쓰지 않아도 오래 메모리에 남지 않는다.
+class ErrorLogWriter:
+    def __init__(self, fileName: str, buffer_size: int = 64 * 1024, flush_interval: float = 1.0, quiet: bool = False):
+        self.path = f'{fileName}.log'
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.quiet = quiet
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.written_count = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.timer = None
+        self.file = open(self.path, 'a', encoding='utf-8')
+        atexit.register(self.close)
+
+    def write(self, message: str):
+        line = f'{message}\n'
+        with self.lock:
+            self.buffer.append(line)
+            self.buffered_bytes += len(line)
+
+            if self.buffered_bytes >= self.buffer_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush_buffer()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        with self.lock:
+            self.flush_buffer()
+
+    # self.lock 을 잡은 상태에서 호출한다.
+    def flush_buffer(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.buffer and not self.file.closed:
+            self.file.writelines(self.buffer)
+            self.file.flush()
+            self.written_count += len(self.buffer)
+            if not self.quiet:
+                print(f'{self.path} 파일에 {len(self.buffer)}줄을 저장했습니다.')
+            self.buffer.clear()
+            self.buffered_bytes = 0
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self.flush_buffer()
+            self.file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 파일 이름별로 ErrorLogWriter 를 하나씩만 만들어서 재사용한다.
+error_log_writers = {}
+
+def get_error_log_writer(fileName: str) -> ErrorLogWriter:
+    writer = error_log_writers.get(fileName)
+    if writer is None or writer.file.closed:
+        writer = ErrorLogWriter(fileName)
+        error_log_writers[fileName] = writer
+    return writer
+
+def save_error_log(content: str, quiet: bool = False):
+    rows = iter_log_rows(content.strip().split('\n'))
+    next(rows, None)
+
+    with ErrorLogWriter('error', quiet=quiet) as writer:
+        for row in rows:
+            if row[1] == 'ERROR':
+                writer.write(','.join(row))
 
 def write_error_log(message: str, fileName: str):
     try:
-        with open(f'{fileName}.log', 'a', encoding='utf-8') as file:
-            file.write(f'{message}\n')
-            print(f'{fileName}.log 파일을 저장했습니다.')
+        get_error_log_writer(fileName).write(message)
     except Exception as e:
         print(f'로그를 기록할 수 없습니다: {e}')
 
-def save_markdown_sections(fileName: str, content: str):
+def confirm_overwrite(fileName: str) -> bool:
     try:
-        with open(f'{fileName}.md', 'r', encoding='utf-8'):
-            choice = input(f'{fileName}.md 파일이 이미 존재합니다. 덮어쓸까요? (y/n): ').strip().lower()
+        with open(fileName, 'r', encoding='utf-8'):
+            choice = input(f'{fileName} 파일이 이미 존재합니다. 덮어쓸까요? (y/n): ').strip().lower()
             if choice != 'y':
                 print('저장을 취소했습니다.')
-                return
+                return False
     except FileNotFoundError:
         print(f'파일을 찾을 수 없습니다: {fileName}')
         pass
@@ -32,6 +125,11 @@ def save_markdown_sections(fileName: str, content: str):
         error_message = f'알 수 없는 오류 발생: {e}'
         print(error_message)
         write_error_log(error_message, 'file_error')
+    return True
+
+def save_markdown_sections(fileName: str, content: str):
+    if not confirm_overwrite(f'{fileName}.md'):
+        return
 
     with open(f'{fileName}.md', 'w', encoding='utf-8') as file:
         file.write(content)
@@ -55,51 +153,173 @@ def read_file(fileName: str):
         print(error_message)
         write_error_log(error_message, 'file_error')
 
-def convert_to_markdown(content: str) -> str:
-    lines = content.strip().split('\n')
-    headers = lines[0].split(',')
-    data = [line.split(',') for line in lines[1:]]
+def markdown_table_header(headers: list) -> str:
+    markdown_header = '| ' + ' | '.join(headers) + ' |\n'
+    markdown_header += '|-' + '-|-'.join(['-' * len(header) for header in headers]) + '-|\n'
+    return markdown_header
 
-    markdown_table = '| ' + ' | '.join(headers) + ' |\n'
-    markdown_table += '|-' + '-|-'.join(['-' * len(header) for header in headers]) + '-|\n'
+def markdown_table_row(row: list) -> str:
+    return '| ' + ' | '.join(row) + ' |\n'
 
-    lines = content.strip().split('\n')
-    data = [line.split(',') for line in lines[1:]]
+def convert_to_markdown(content: str) -> str:
+    rows = iter_log_rows(content.strip().split('\n'))
+    headers = next(rows, [])
 
-    for row in data:
+    markdown_table = markdown_table_header(headers)
+    for row in rows:
         if row[1] == 'ERROR':
-            markdown_table += '| ' + ' | '.join(row) + ' |\n'
+            markdown_table += markdown_table_row(row)
 
     return markdown_table
 
+# 로그를 한 번만 훑으면서 ERROR 필터, error.log 기록, 마크다운 표 작성을 동시에 처리한다.
+# 한 번에 한 줄만 메모리에 있으므로 로그 크기와 상관없이 메모리 사용량이 일정하다.
+def analyze_log_stream(fileName: str, markdownName: str, errorName: str) -> int:
+    write_markdown = confirm_overwrite(f'{markdownName}.md')
+    error_count = 0
+
+    try:
+        with open(fileName, 'r', encoding='utf-8') as log_file, \
+                ErrorLogWriter(errorName, quiet=True) as error_writer, \
+                open(f'{markdownName}.md' if write_markdown else os.devnull, 'w', encoding='utf-8') as markdown_file:
+            rows = iter_log_rows(log_file)
+            headers = next(rows, None)
+            if headers is None:
+                return 0
+
+            markdown_file.write(markdown_table_header(headers))
+            for row in rows:
+                if len(row) > 1 and row[1] == 'ERROR':
+                    error_writer.write(','.join(row))
+                    markdown_file.write(markdown_table_row(row))
+                    error_count += 1
+    except FileNotFoundError:
+        error_message = f'{fileName} 파일을 찾을 수 없습니다.'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+        return 0
+    except PermissionError:
+        error_message = f'{fileName} 파일에 접근할 권한이 없습니다.'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+        return 0
+    except Exception as e:
+        error_message = f'알 수 없는 오류 발생: {e}'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+        return 0
+
+    print(f'{errorName}.log 파일에 에러 {error_count}건을 저장했습니다.')
+    if write_markdown:
+        print(f'{markdownName}.md 파일을 저장했습니다.')
+    return error_count
+
+# 'YYYY-MM-DD HH:MM:SS' 형식의 시간을 YYYYMMDDHHMMSS 정수로 한 번만 변환한다.
+# 정렬 비교 때마다 문자열을 다시 나누지 않도록 정수 키를 사용한다.
+def timestamp_key(timestamp: str) -> int:
+    try:
+        return int(timestamp.translate(TIMESTAMP_SEPARATORS))
+    except ValueError:
+        return -1
+
+def log_line_key(line: str) -> int:
+    return timestamp_key(line.split(',', 1)[0])
+
 def sort_file_content_by_timestamp(file_content: str) -> str:
     lines = file_content.strip().split('\n')
     headers = lines[0]
     data = [line for line in lines[1:] if line.strip()]
 
-    data.sort(key = lambda x: x.split(',')[0], reverse = True)
+    data.sort(key = log_line_key, reverse = True)
 
     sorted_content = '\n'.join([headers] + data)
     return sorted_content
 
-def main():
-    file_content = read_file('mission_computer_main.log')
+# 정렬된 한 덩어리(run)를 임시 파일로 내보내고 파일 경로를 반환한다.
+def write_sorted_run(lines: list) -> str:
+    lines.sort(key = log_line_key, reverse = True)
+    with tempfile.NamedTemporaryFile('w', encoding='utf-8', suffix='.run', delete=False) as run_file:
+        run_file.writelines(lines)
+    return run_file.name
+
+def iter_run_lines(run_path: str):
+    with open(run_path, 'r', encoding='utf-8') as run_file:
+        yield from run_file
+
+# 메모리보다 큰 로그를 위한 외부 정렬(external merge sort).
+# memory_budget 바이트만큼씩 읽어서 정렬한 뒤 임시 파일로 저장하고,
+# 마지막에 heapq 로 k-way 병합해서 시간의 역순으로 한 줄씩 돌려준다.
+def iter_sorted_log_lines(log_file, memory_budget: int = SORT_MEMORY_BUDGET):
+    run_paths = []
+    chunk = []
+    chunk_size = 0
+
+    try:
+        for line in log_file:
+            if not line.strip():
+                continue
+            if not line.endswith('\n'):
+                line += '\n'
+            chunk.append(line)
+            chunk_size += len(line)
+            if chunk_size >= memory_budget:
+                run_paths.append(write_sorted_run(chunk))
+                chunk = []
+                chunk_size = 0
 
-    if file_content:
-        # 설치가 잘 되었는지 확인 하기 위해서 ‘Hello Mars’를 출력해 본다. 
-        print('Hello Mars')
+        # 전체가 한 덩어리에 들어가면 임시 파일 없이 메모리에서 바로 정렬한다.
+        if not run_paths:
+            chunk.sort(key = log_line_key, reverse = True)
+            for line in chunk:
+                yield line.rstrip('\n')
+            return
 
-        # 출력 결과를 시간의 역순으로 정렬해서 출력한다. 
-        sorted_file_content = sort_file_content_by_timestamp(file_content)
+        if chunk:
+            run_paths.append(write_sorted_run(chunk))
+            chunk = []
 
-        # mission_computer_main.log 내용 출력
-        print(sorted_file_content)
+        runs = [iter_run_lines(run_path) for run_path in run_paths]
+        for line in heapq.merge(*runs, key = log_line_key, reverse = True):
+            yield line.rstrip('\n')
+    finally:
+        for run_path in run_paths:
+            try:
+                os.remove(run_path)
+            except OSError:
+                pass
 
-        # 출력 결과 중 문제가 되는 부분만 따로 파일로 저장한다. 
-        save_error_log(file_content)
+def print_sorted_log(fileName: str, memory_budget: int = SORT_MEMORY_BUDGET) -> bool:
+    try:
+        with open(fileName, 'r', encoding='utf-8') as log_file:
+            # 설치가 잘 되었는지 확인 하기 위해서 ‘Hello Mars’를 출력해 본다. 
+            print('Hello Mars')
+
+            print(log_file.readline().strip())
+            for line in iter_sorted_log_lines(log_file, memory_budget):
+                print(line)
+        return True
+    except FileNotFoundError:
+        error_message = f'{fileName} 파일을 찾을 수 없습니다.'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+    except PermissionError:
+        error_message = f'{fileName} 파일에 접근할 권한이 없습니다.'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+    except Exception as e:
+        error_message = f'알 수 없는 오류 발생: {e}'
+        print(error_message)
+        write_error_log(error_message, 'file_error')
+    return False
 
-        # mission_computer_main.log 내용 사고의 원인을 분석하고 정리
-        convert_content = convert_to_markdown(file_content)
+def main(memory_budget: int = SORT_MEMORY_BUDGET):
+    # 출력 결과를 시간의 역순으로 정렬해서 출력한다. 
+    # 로그가 메모리보다 커도 되도록 외부 정렬로 mission_computer_main.log 내용을 출력한다.
+    if print_sorted_log('mission_computer_main.log', memory_budget):
+        # 출력 결과 중 문제가 되는 부분만 따로 파일로 저장하고,
+        # mission_computer_main.log 내용 사고의 원인을 분석해서 log_analysis 를 작성한다.
+        # 두 작업 모두 로그를 한 번만 스트리밍으로 읽으면서 처리한다.
+        analyze_log_stream('mission_computer_main.log', 'log_analysis', 'error')
 
-        # log_analysis 작성
-        save_markdown_sections('log_analysis', convert_content)
+if __name__ == '__main__':
+    main()
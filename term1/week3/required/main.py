@@ -1,11 +1,101 @@
+import bisect
+import csv
+import io
+import math
+import mmap
+import os
 import struct
+import sys
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from operator import itemgetter
+
+BINARY_MAGIC = b'MARSINV1'
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct('<8sIII5I')
+STRING_LENGTH = struct.Struct('<I')
+MISSING_VALUE = 'Various'
+INDEX_MAGIC = b'MARSFLX1'
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct('<8sIIII')
+FLAMMABILITY_INDEX_SUFFIX = '.flammability.idx'
+# read_inventory_columns 에서 이보다 큰 CSV 파일은 여러 프로세스로 나눠서 파싱한다. (바이트)
+CSV_CHUNK_SIZE = 16 * 1024 * 1024
+
+# 숫자로 바꿀 수 없는 값(Various 등)은 NaN 으로 저장한다.
+def parse_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+def format_float(value):
+    return MISSING_VALUE if math.isnan(value) else repr(value)
+
+# 인벤토리 한 행. 숫자 열은 읽을 때 한 번만 float 로 바꿔 두고, __slots__ 로 행마다 dict 를 만들지 않는다.
+# texts 에는 숫자 열(Weight, Specific Gravity, Flammability)의 원래 문자열을 보관해서
+# '0' 이나 'Various' 외의 값도 저장했다가 다시 읽을 때 그대로 돌려준다.
+class InventoryItem:
+    __slots__ = ('substance', 'weight', 'specific_gravity', 'strength', 'flammability', 'texts')
+
+    def __init__(self, substance, weight, specific_gravity, strength, flammability, texts=None):
+        self.substance = substance
+        self.weight = weight
+        self.specific_gravity = specific_gravity
+        self.strength = strength
+        self.flammability = flammability
+        self.texts = texts
+
+    @classmethod
+    def from_row(cls, row):
+        texts = (row[1], row[2], row[4])
+        return cls(row[0], parse_float(row[1]), parse_float(row[2]), row[3], parse_float(row[4]), texts)
+
+    # 원래 문자열이 없으면(숫자로 만든 항목) 숫자를 문자열로 바꾼다.
+    def number_texts(self):
+        if self.texts:
+            return self.texts
+        return format_float(self.weight), format_float(self.specific_gravity), format_float(self.flammability)
+
+    def to_row(self):
+        weight, specific_gravity, flammability = self.number_texts()
+        return [self.substance, weight, specific_gravity, self.strength, flammability]
+
+# 정렬 키: 인화성 지수를 알 수 없는(NaN) 항목은 맨 뒤로 보낸다.
+def flammability_key(item):
+    return -math.inf if math.isnan(item.flammability) else item.flammability
+
+# 한 줄씩 읽으면서 CSV 행을 돌려주는 스트리밍 함수 (따옴표로 감싼 쉼표도 올바르게 처리)
+def iter_csv_rows(filename):
+    with open(filename, 'r', encoding='utf-8', newline='') as file:
+        for row in csv.reader(file):
+            if row:
+                yield row
+
+# 파일을 chunk_size 바이트 근처의 줄 경계에서 나눈 구간 목록
+# 따옴표 안에 줄바꿈이 들어간 필드는 구간 경계에서 나뉠 수 있으므로 이런 파일은 iter_csv_rows 를 사용한다.
+def split_csv_chunks(filename, chunk_size, start=0):
+    file_size = os.path.getsize(filename)
+    boundaries = [start]
+    with open(filename, 'rb') as file:
+        position = start + chunk_size
+        while position < file_size:
+            file.seek(position)
+            file.readline()
+            boundary = file.tell()
+            if boundary >= file_size:
+                break
+            boundaries.append(boundary)
+            position = boundary + chunk_size
+    boundaries.append(file_size)
+    return [(filename, start, end) for start, end in zip(boundaries, boundaries[1:])]
 
 # CSV 파일 읽기 함수
 def read_csv_file(filename):
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            lines = file.readlines()
-        return [line.strip().split(',') for line in lines]  # 쉼표로 분리
+        return list(iter_csv_rows(filename))
     except FileNotFoundError:
         print(f'Error: {filename} 파일을 찾을 수 없습니다.')
         return []
@@ -13,72 +103,432 @@ def read_csv_file(filename):
         print(f'Error: {e}')
         return []
 
+# 인벤토리를 열 단위로 담는 클래스 (이진 파일과 같은 구조)
+#   numbers: Weight, Specific Gravity, Flammability 의 float 열
+#   text_ids: 5개 열 원래 문자열의 문자열 테이블 번호
+# 행마다 객체를 만들지 않으므로 큰 CSV 를 여러 프로세스에서 읽을 때 작은 배열만 주고받으면 된다.
+class InventoryColumns:
+    TEXT_COLUMNS = 5
+    NUMBER_COLUMNS = (1, 2, 4)
+
+    def __init__(self, header=None):
+        self.header = header
+        self.strings = []
+        self.string_ids = {}
+        self.text_ids = [array('I') for _ in range(self.TEXT_COLUMNS)]
+        self.numbers = [array('d') for _ in self.NUMBER_COLUMNS]
+        self.header_ids = [self.string_id(name) for name in header] if header else []
+
+    def string_id(self, text):
+        if self.string_ids is None:
+            self.string_ids = {text: string_id for string_id, text in enumerate(self.strings)}
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            string_id = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def append_row(self, row):
+        for ids, text in zip(self.text_ids, row):
+            ids.append(self.string_id(text))
+        for numbers, column in zip(self.numbers, self.NUMBER_COLUMNS):
+            numbers.append(parse_float(row[column]))
+
+    def append_item(self, item):
+        for ids, text in zip(self.text_ids, item.to_row()):
+            ids.append(self.string_id(text))
+        for numbers, value in zip(self.numbers, (item.weight, item.specific_gravity, item.flammability)):
+            numbers.append(value)
+
+    # 프로세스 사이에 주고받을 때는 dict 없이 문자열 목록과 배열만 보낸다.
+    def compact(self):
+        return self.strings, self.text_ids, self.numbers
+
+    # 다른 구간의 결과를 뒤에 붙인다.
+    # 구간마다 문자열이 대부분 다르므로 중복을 다시 찾지 않고 문자열 목록을 이어 붙인 뒤 번호만 그만큼 민다.
+    # (구간 사이의 중복 문자열은 문자열 테이블에 한 번 더 저장될 뿐 값은 같다.)
+    def extend(self, compact):
+        strings, text_ids, numbers = compact
+        offset = len(self.strings)
+        self.strings.extend(strings)
+        self.string_ids = None
+        for ids, other in zip(self.text_ids, text_ids):
+            ids.extend(map(offset.__add__, other) if offset else other)
+        for values, other in zip(self.numbers, numbers):
+            values.extend(other)
+
+    def __len__(self):
+        return len(self.numbers[0])
+
+    @property
+    def flammabilities(self):
+        return self.numbers[2]
+
+    def item(self, index):
+        substance, weight, gravity, strength, flammability = (self.strings[ids[index]] for ids in self.text_ids)
+        return InventoryItem(
+            substance,
+            self.numbers[0][index],
+            self.numbers[1][index],
+            strength,
+            self.numbers[2][index],
+            (weight, gravity, flammability),
+        )
+
+    # 인화성 지수 내림차순 행 번호 (process_inventory 와 같이 NaN 은 맨 뒤, 같은 값은 원래 순서)
+    def flammability_order(self):
+        keys = array('d', (-math.inf if math.isnan(value) else value for value in self.flammabilities))
+        return sorted(range(len(self)), key=keys.__getitem__, reverse=True)
+
+# 파일의 [start, end) 바이트 구간을 CSV 로 파싱해서 열 단위 결과로 돌려준다. 프로세스 풀에서 실행되는 작업 단위.
+# 숫자 변환까지 여기서 끝내고, 부모 프로세스에는 문자열 목록과 배열만 보낸다.
+def parse_inventory_chunk(task):
+    filename, start, end = task
+    with open(filename, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+    columns = InventoryColumns()
+    for row in csv.reader(io.StringIO(data.decode('utf-8'), newline='')):
+        if row:
+            columns.append_row(row)
+    return columns.compact()
+
+# 큰 인벤토리 CSV 를 열 단위로 읽는다.
+# 줄 경계에서 나눈 구간을 프로세스 풀에서 파싱·변환하고, 부모는 배열을 이어 붙이기만 하므로 코어 수만큼 빨라진다.
+def read_inventory_columns(filename, processes=None, chunk_size=CSV_CHUNK_SIZE):
+    try:
+        # 첫 줄은 헤더이고, 데이터 구간은 그 다음부터 나눈다.
+        with open(filename, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8')]))
+            data_start = file.tell()
+        columns = InventoryColumns(header)
+        chunks = split_csv_chunks(filename, chunk_size, data_start)
+
+        if len(chunks) == 1 or processes == 1:
+            for chunk in chunks:
+                columns.extend(parse_inventory_chunk(chunk))
+            return columns
+
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for compact in executor.map(parse_inventory_chunk, chunks):
+                columns.extend(compact)
+        return columns
+    except FileNotFoundError:
+        print(f'Error: {filename} 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'Error: {e}')
+    return None
+
 # 데이터를 정렬하고 필터링하는 함수
 def process_inventory(data):
     if not data:
         return []
     
     header = data[0]  # 헤더 저장
-    inventory = data[1:]  # 실제 데이터
+    inventory = [InventoryItem.from_row(row) for row in data[1:]]  # 실제 데이터 (숫자는 여기서 한 번만 변환)
 
     # 인화성 기준으로 내림차순 정렬
-    try:
-        inventory.sort(key=lambda x: float(x[4]), reverse=True)  # 인화성 지수 (5번째 열) 기준으로 정렬
-    except ValueError:
-        print('Error: Flammability 값을 숫자로 변환할 수 없습니다.')
-        return []
+    inventory.sort(key=flammability_key, reverse=True)  # 미리 변환해 둔 인화성 지수로 정렬
 
     return [header] + inventory  # 헤더 포함하여 반환
 
 # 인화성 지수가 0.7 이상인 항목을 필터링하는 함수
 def filter_dangerous_items(data, threshold=0.7):
-    return [row for row in data[1:] if float(row[4]) >= threshold]  # 데이터의 2번째 행부터 필터링
+    return [item for item in data[1:] if item.flammability >= threshold]  # 데이터의 2번째 행부터 필터링
 
 # CSV 파일로 저장하는 함수
 def save_to_csv(filename, data):
     try:
-        with open(filename, 'w', encoding='utf-8') as file:
+        with open(filename, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')  # 쉼표가 들어간 값은 따옴표로 감싼다
             for row in data:
-                line = ','.join(row) + '\n' 
-                file.write(line)
+                if isinstance(row, InventoryItem):
+                    row = row.to_row()
+                writer.writerow(row)
         print(f'CSV 파일로 저장 완료: {filename}')
     except Exception as e:
         print(f'Error: {e}')
 
-# 이진 파일로 저장
+# 이진 파일 구조 (리틀 엔디언)
+#   헤더: 매직, 버전, 행 수, 문자열 수, 열 이름 5개의 문자열 번호
+#   float64 열 3개: Weight, Specific Gravity, Flammability (각각 행 수 * 8 바이트)
+#   uint32 열 2개: Substance, Strength 의 문자열 번호 (각각 행 수 * 4 바이트)
+#   uint32 열 3개: Weight, Specific Gravity, Flammability 의 원래 문자열 번호 (다시 읽을 때 그대로 출력)
+#   문자열 테이블: (uint32 길이 + UTF-8 바이트) 반복
+# 열마다 고정 폭으로 붙어 있으므로 mmap 으로 연 뒤 필요한 열만 바로 읽을 수 있다.
 def save_to_binary(filename, data):
+    if not data:
+        print('이진 파일로 저장할 데이터가 없습니다.')
+        return
 
-    # 각 리스트(행)를 쉼표로 구분하여 텍스트로 변환하고, 그 결과를 하나의 문자열로 결합
-    text_data = '\n'.join([', '.join(row) for row in data])  # 각 행을 쉼표로 구분하고, 각 행을 줄바꿈으로 연결
+    columns = InventoryColumns(data[0])
+    for row in data[1:]:
+        if isinstance(row, InventoryItem):
+            columns.append_item(row)
+        else:
+            columns.append_row(row)
+    save_columns_to_binary(filename, columns)
 
-    # 텍스트를 바이트로 변환
-    encoded_data = text_data.encode()  # .encode()를 사용하여 문자열을 바이트로 변환
+# 열 단위 인벤토리를 그대로 이진 파일로 저장한다. order 를 주면 그 행 순서대로 저장한다.
+def save_columns_to_binary(filename, columns, order=None):
+    text_ids = columns.text_ids
+    weights, gravities, flammabilities = columns.numbers
+    column_list = [weights, gravities, flammabilities, text_ids[0], text_ids[3], text_ids[1], text_ids[2], text_ids[4]]
+    if order is not None:
+        pick = itemgetter(*order) if len(order) > 1 else lambda column: [column[i] for i in order]
+        column_list = [array(column.typecode, pick(column)) for column in column_list]
 
     try:
         with open(filename, 'wb') as file:
-            
-            file.write(encoded_data)
-                
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(columns), len(columns.strings), *columns.header_ids))
+            for column in column_list:
+                write_column(file, column)
+            # 문자열 테이블은 (길이, 바이트) 를 번갈아 이어 붙여서 한 번에 쓴다.
+            encoded = [text.encode('utf-8') for text in columns.strings]
+            file.write(b''.join(chain.from_iterable(zip(map(STRING_LENGTH.pack, map(len, encoded)), encoded))))
+
+        # 이전 내용으로 만든 인화성 지수 인덱스는 더 이상 맞지 않으므로 지운다.
+        if os.path.exists(flammability_index_path(filename)):
+            os.remove(flammability_index_path(filename))
         print(f'\n이진 파일로 저장 완료: {filename}')
     except Exception as e:
         print(f'이진 파일로 저장 Error: {e}')
 
+# mmap 의 offset 부터 count 개의 고정 폭 값을 열로 읽는다. (복사 없이 memoryview 로 접근)
+# 빅 엔디언 시스템에서는 복사한 뒤 바이트 순서를 바꾼다.
+def map_column(mm, typecode, offset, count):
+    end = offset + struct.calcsize(typecode) * count
+    if sys.byteorder == 'little':
+        values = memoryview(mm)[offset:end].cast(typecode)
+    else:
+        values = array(typecode, mm[offset:end])
+        values.byteswap()
+    return values, end
+
+def write_column(file, column):
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    column.tofile(file)
+
+# 이진 파일을 mmap 으로 열어서 열 단위로 읽는 클래스
+# float 열은 memoryview 로 바로 읽으므로 행 전체를 디코딩하지 않고 필요한 열만 훑을 수 있다.
+class InventoryBinary:
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.file.close()
+            raise
+
+        try:
+            magic, version, self.row_count, string_count, *name_ids = BINARY_HEADER.unpack_from(self.mm, 0)
+            if magic != BINARY_MAGIC or version != BINARY_VERSION:
+                raise ValueError(f'{filename} 은(는) 인벤토리 이진 파일이 아닙니다.')
+
+            offset = BINARY_HEADER.size
+            self.weights, offset = self.column('d', offset)
+            self.gravities, offset = self.column('d', offset)
+            self.flammability_offset = offset
+            self.flammabilities, offset = self.column('d', offset)
+            self.substance_ids, offset = self.column('I', offset)
+            self.strength_ids, offset = self.column('I', offset)
+            self.weight_text_ids, offset = self.column('I', offset)
+            self.gravity_text_ids, offset = self.column('I', offset)
+            self.flammability_text_ids, offset = self.column('I', offset)
+
+            self.strings = []
+            for _ in range(string_count):
+                (length,) = struct.unpack_from('<I', self.mm, offset)
+                offset += 4
+                self.strings.append(self.mm[offset:offset + length].decode('utf-8'))
+                offset += length
+            self.header = [self.strings[name_id] for name_id in name_ids]
+        except Exception:
+            self.close()
+            raise
+
+    def column(self, typecode, offset):
+        return map_column(self.mm, typecode, offset, self.row_count)
+
+    def __len__(self):
+        return self.row_count
+
+    def item(self, index):
+        return InventoryItem(
+            self.strings[self.substance_ids[index]],
+            self.weights[index],
+            self.gravities[index],
+            self.strings[self.strength_ids[index]],
+            self.flammabilities[index],
+            (
+                self.strings[self.weight_text_ids[index]],
+                self.strings[self.gravity_text_ids[index]],
+                self.strings[self.flammability_text_ids[index]],
+            ),
+        )
+
+    def row(self, index):
+        return self.item(index).to_row()
+
+    def rows(self):
+        return [self.header] + [self.row(i) for i in range(self.row_count)]
+
+    # 인덱스가 이 파일로 만든 것인지 확인할 때 쓰는 Flammability 열의 CRC-32
+    def flammability_crc(self):
+        start = self.flammability_offset
+        with memoryview(self.mm)[start:start + 8 * self.row_count] as column:
+            return zlib.crc32(column)
+
+    # Flammability 열만 훑어서 threshold 이상인 행 번호를 반환한다.
+    def dangerous_indexes(self, threshold=0.7):
+        return [i for i, value in enumerate(self.flammabilities) if value >= threshold]
+
+    def close(self):
+        for name in ('weights', 'gravities', 'flammabilities', 'substance_ids', 'strength_ids',
+                     'weight_text_ids', 'gravity_text_ids', 'flammability_text_ids'):
+            values = self.__dict__.pop(name, None)
+            if isinstance(values, memoryview):
+                values.release()
+        if not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 # 이진 파일에서 읽어오기
 def read_from_binary(filename):
     try:
-        # 바이너리 모드로 파일을 읽기
-        with open(filename, 'rb') as file:
-            encoded_data = file.read()  # 파일에서 바이트 데이터를 읽음
+        with InventoryBinary(filename) as inventory:
+            rows = inventory.rows()
 
-        # 바이트 데이터를 텍스트로 변환
-        decoded_data = encoded_data.decode()  # .decode()를 사용하여 바이트 데이터를 문자열로 변환
-        
-        print(decoded_data)
-        
+        print('\n'.join([', '.join(row) for row in rows]))
+        return rows
     except FileNotFoundError:
         print(f'Error: {filename} 파일을 찾을 수 없습니다.')
     except Exception as e:
         print(f'이진 파일에서 읽어오기 Error: {e}')
+    return []
+
+def flammability_index_path(filename):
+    return filename + FLAMMABILITY_INDEX_SUFFIX
+
+# 이진 파일 옆에 인화성 지수 정렬 인덱스를 저장한다.
+#   헤더: 매직, 버전, 인벤토리 행 수, 인덱스 항목 수, 이진 파일 Flammability 열의 CRC-32
+#   float64 열: 인화성 지수 오름차순 (NaN 제외)
+#   uint32 열: 각 값에 해당하는 인벤토리 행 번호
+# 같은 인화성 지수끼리는 행 번호가 큰 것이 앞에 오도록 저장해서, 뒤에서부터 읽으면 원래 행 순서가 된다.
+def save_flammability_index(filename):
+    try:
+        with InventoryBinary(filename) as inventory:
+            order = [i for i, value in enumerate(inventory.flammabilities) if not math.isnan(value)]
+            order.sort(key=lambda i: (inventory.flammabilities[i], -i))
+            values = array('d', (inventory.flammabilities[i] for i in order))
+            row_count = inventory.row_count
+            column_crc = inventory.flammability_crc()
+
+        index_filename = flammability_index_path(filename)
+        with open(index_filename, 'wb') as file:
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, row_count, len(order), column_crc))
+            write_column(file, values)
+            write_column(file, array('I', order))
+
+        print(f'인화성 지수 인덱스 저장 완료: {index_filename}')
+    except FileNotFoundError:
+        print(f'Error: {filename} 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'인덱스 저장 Error: {e}')
+
+# 인화성 지수 인덱스를 mmap 으로 열어서 bisect 로 O(log n) 질의를 하는 클래스
+class FlammabilityIndex:
+    def __init__(self, filename):
+        self.file = open(flammability_index_path(filename), 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.file.close()
+            raise
+
+        try:
+            magic, version, self.inventory_rows, self.count, self.column_crc = INDEX_HEADER.unpack_from(self.mm, 0)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f'{filename} 의 인화성 지수 인덱스 형식이 올바르지 않습니다.')
+
+            offset = INDEX_HEADER.size
+            self.values, offset = map_column(self.mm, 'd', offset, self.count)
+            self.rows, offset = map_column(self.mm, 'I', offset, self.count)
+        except Exception:
+            self.close()
+            raise
+
+    # 이진 파일이 인덱스를 만든 뒤 다시 저장되었으면 행 수가 같아도 CRC 가 달라진다.
+    def matches(self, inventory):
+        return self.inventory_rows == inventory.row_count and self.column_crc == inventory.flammability_crc()
+
+    # 인화성 지수가 threshold 이상인 항목 수
+    def count_at_least(self, threshold):
+        return self.count - bisect.bisect_left(self.values, threshold)
+
+    # 인화성 지수가 threshold 이상인 행 번호 (높은 순)
+    def at_least(self, threshold):
+        start = bisect.bisect_left(self.values, threshold)
+        return [self.rows[i] for i in range(self.count - 1, start - 1, -1)]
+
+    # 인화성 지수가 가장 높은 k 개의 행 번호 (높은 순)
+    def top(self, k):
+        start = max(self.count - k, 0)
+        return [self.rows[i] for i in range(self.count - 1, start - 1, -1)]
+
+    def close(self):
+        for name in ('values', 'rows'):
+            values = self.__dict__.pop(name, None)
+            if isinstance(values, memoryview):
+                values.release()
+        if not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 이진 파일의 인화성 지수가 threshold 이상인 항목을 필터링하는 함수
+# 인덱스가 있으면 bisect 로 바로 찾고, 없거나 이진 파일과 맞지 않으면 Flammability 열만 훑는다.
+def filter_dangerous_items_binary(filename, threshold=0.7):
+    try:
+        with InventoryBinary(filename) as inventory:
+            try:
+                with FlammabilityIndex(filename) as index:
+                    if index.matches(inventory):
+                        return [inventory.item(i) for i in index.at_least(threshold)]
+            except (FileNotFoundError, ValueError):
+                pass
+            return [inventory.item(i) for i in inventory.dangerous_indexes(threshold)]
+    except FileNotFoundError:
+        print(f'Error: {filename} 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'이진 파일에서 읽어오기 Error: {e}')
+    return []
+
+# 인화성 지수가 가장 높은 k 개 항목
+def top_flammable_items(filename, k=10):
+    try:
+        with InventoryBinary(filename) as inventory, FlammabilityIndex(filename) as index:
+            if not index.matches(inventory):
+                raise ValueError('인화성 지수 인덱스가 이진 파일과 맞지 않습니다. save_flammability_index 로 다시 만들어 주세요.')
+            return [inventory.item(i) for i in index.top(k)]
+    except FileNotFoundError:
+        print(f'Error: {filename} 또는 인덱스 파일을 찾을 수 없습니다.')
+    except Exception as e:
+        print(f'이진 파일에서 읽어오기 Error: {e}')
+    return []
 
 if __name__ == '__main__':
     input_file = 'Mars_Base_Inventory_List.csv'
@@ -102,8 +552,8 @@ if __name__ == '__main__':
         if dangerous_items:
             # 인화성 지수가 0.7 이상되는 목록을 뽑아서 별도로 출력한다.
             print('인화성 지수가 0.7 이상인 항목 ')
-            for row in dangerous_items:
-                print(f'물질: {row[0]}, 인화성 지수: {row[4]}')
+            for item in dangerous_items:
+                print(f'물질: {item.substance}, 인화성 지수: {item.flammability}')
             
             # '인화성 지수가 0.7 이상되는 목록을 CSV 포멧(Mars_Base_Inventory_danger.csv)으로 저장한다.'
             save_to_csv(danger_file, [csv_data[0]] + dangerous_items)
@@ -111,6 +561,9 @@ if __name__ == '__main__':
             # 인화성 순서로 정렬된 배열의 내용을 이진 파일형태로 저장한다. 파일이름은 Mars_Base_Inventory_List.bin
             save_to_binary(binary_file, processed_data)
 
+            # 여러 기준값으로 자주 조회할 수 있도록 인화성 지수 정렬 인덱스를 함께 저장한다.
+            save_flammability_index(binary_file)
+
             # '저장된 Mars_Base_Inventory_List.bin 의 내용을 다시 읽어 들여서 화면에 내용을 출력한다.'
             print('\n이진 파일에서 데이터 다시 읽기 ')
             read_from_binary(binary_file)
@@ -1,4 +1,10 @@
 import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # 더미 센서에 해당하는 클래스를 생성한다. 클래스의 이름은 DummySensor로 정의한다. 
 class DummySensor:
@@ -21,6 +27,40 @@ class DummySensor:
         self.env_values['mars_base_external_illuminance'] = random.randint(500, 715)
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 3)
         self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4.0, 7.0), 2)
+
+    # N 개의 샘플을 한 번에 만들어서 키마다 연속된 타입 배열로 돌려준다. (env_values 는 바꾸지 않는다)
+    # backend 가 'numpy' 이면 numpy 배열을, 'array' 이면 array 모듈의 배열을 사용하고,
+    # 주지 않으면 numpy 가 설치되어 있을 때 numpy 를 사용한다. 값의 범위와 반올림은 set_env() 와 같다.
+    # 두 방식은 난수 생성기가 달라서, seed 를 주었을 때 같은 값이 나오는 것은 같은 backend 안에서뿐이다.
+    # 설치 환경과 상관없이 같은 값이 필요하면 backend 도 함께 지정한다.
+    def generate_env_batch(self, count, seed=None, backend=None):
+        if backend is None:
+            backend = 'numpy' if np is not None else 'array'
+        if backend not in ('numpy', 'array'):
+            raise ValueError(f'알 수 없는 backend 입니다: {backend}')
+        if backend == 'numpy' and np is None:
+            raise ImportError('numpy 가 설치되어 있지 않습니다.')
+
+        if backend == 'numpy':
+            rng = np.random.default_rng(seed)
+            return {
+                'mars_base_internal_temperature': rng.integers(18, 31, count, dtype=np.int32),
+                'mars_base_external_temperature': rng.integers(0, 22, count, dtype=np.int32),
+                'mars_base_internal_humidity': rng.integers(50, 61, count, dtype=np.int32),
+                'mars_base_external_illuminance': rng.integers(500, 716, count, dtype=np.int32),
+                'mars_base_internal_co2': np.round(rng.uniform(0.02, 0.1, count), 3),
+                'mars_base_internal_oxygen': np.round(rng.uniform(4.0, 7.0, count), 2),
+            }
+
+        rng = random.Random(seed)
+        return {
+            'mars_base_internal_temperature': array('i', rng.choices(range(18, 31), k=count)),
+            'mars_base_external_temperature': array('i', rng.choices(range(0, 22), k=count)),
+            'mars_base_internal_humidity': array('i', rng.choices(range(50, 61), k=count)),
+            'mars_base_external_illuminance': array('i', rng.choices(range(500, 716), k=count)),
+            'mars_base_internal_co2': array('d', [round(rng.uniform(0.02, 0.1), 3) for _ in range(count)]),
+            'mars_base_internal_oxygen': array('d', [round(rng.uniform(4.0, 7.0), 2) for _ in range(count)]),
+        }
     
     # DummySensor 클래스는 get_env() 메소드를 추가하는데 get_env() 메소드는 env_values를 return 한다. 
     def get_env(self):
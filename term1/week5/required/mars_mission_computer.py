@@ -1,5 +1,53 @@
+import asyncio
+import atexit
+import bisect
+import math
+import mmap
+import os
 import random
+import struct
 import time
+from array import array
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 센서 값을 읽는 주기 (초)
+SAMPLE_INTERVAL = 5
+# 이동 평균을 유지할 구간 (이름: 초)
+ROLLING_WINDOWS = {'1m': 60, '5m': 5 * 60, '1h': 60 * 60}
+# 센서를 따로 지정하지 않을 때 사용하는 기본 센서(DummySensor) 이름
+DEFAULT_SENSOR = 'ds'
+# 소비자(출력/기록/평균)별 대기 큐 크기. 가득 차면 가장 오래된 측정값부터 버린다.
+QUEUE_SIZE = 10000
+
+# 이진 센서 로그 형식: 파일 헤더(매직, 버전, 레코드 크기) 뒤에 고정 폭 레코드가 이어진다.
+# 레코드: 시각(epoch 밀리초, int64) + 정수 4개(int16) + 실수 2개(float64)
+SENSOR_LOG_MAGIC = b'MARSENV1'
+SENSOR_LOG_VERSION = 1
+SENSOR_LOG_HEADER = struct.Struct('<8sII')
+SENSOR_RECORD = struct.Struct('<q4h2d')
+# 집계 레코드: 구간 시작(epoch 밀리초) + 측정 횟수 + 환경값별 평균 6개, 최솟값 6개, 최댓값 6개
+AGGREGATE_LOG_MAGIC = b'MARSAGG1'
+AGGREGATE_RECORD = struct.Struct('<qI4x18d')
+
+# 센서 기록 보존 단계별 집계 폭, 파일 하나가 담는 기간, 이 길이 이하의 조회에 사용하는 단계 (초)
+DAY_SECONDS = 24 * 60 * 60
+HISTORY_BUCKETS = {'1m': 60, '1h': 60 * 60}
+HISTORY_SEGMENTS = {'raw': 60 * 60, '1m': DAY_SECONDS, '1h': 30 * DAY_SECONDS}
+HISTORY_QUERY_SPANS = {'raw': 6 * 60 * 60, '1m': 7 * DAY_SECONDS}
+
+SENSOR_KEYS = (
+    'mars_base_internal_temperature',
+    'mars_base_external_temperature',
+    'mars_base_internal_humidity',
+    'mars_base_external_illuminance',
+    'mars_base_internal_co2',
+    'mars_base_internal_oxygen',
+)
 
 class DummySensor:
     def __init__(self):
@@ -20,10 +68,479 @@ class DummySensor:
         self.env_values['mars_base_internal_co2'] = round(random.uniform(0.02, 0.1), 3)
         self.env_values['mars_base_internal_oxygen'] = round(random.uniform(4.0, 7.0), 1)
 
+    # N 개의 샘플을 한 번에 만들어서 키마다 연속된 타입 배열로 돌려준다. (env_values 는 바꾸지 않는다)
+    # backend 가 'numpy' 이면 numpy 배열을, 'array' 이면 array 모듈의 배열을 사용하고,
+    # 주지 않으면 numpy 가 설치되어 있을 때 numpy 를 사용한다. 값의 범위와 반올림은 set_env() 와 같다.
+    # 두 방식은 난수 생성기가 달라서, seed 를 주었을 때 같은 값이 나오는 것은 같은 backend 안에서뿐이다.
+    # 설치 환경과 상관없이 같은 값이 필요하면 backend 도 함께 지정한다.
+    def generate_env_batch(self, count, seed=None, backend=None):
+        if backend is None:
+            backend = 'numpy' if np is not None else 'array'
+        if backend not in ('numpy', 'array'):
+            raise ValueError(f'알 수 없는 backend 입니다: {backend}')
+        if backend == 'numpy' and np is None:
+            raise ImportError('numpy 가 설치되어 있지 않습니다.')
+
+        if backend == 'numpy':
+            rng = np.random.default_rng(seed)
+            return {
+                'mars_base_internal_temperature': rng.integers(18, 31, count, dtype=np.int32),
+                'mars_base_external_temperature': rng.integers(0, 22, count, dtype=np.int32),
+                'mars_base_internal_humidity': rng.integers(50, 61, count, dtype=np.int32),
+                'mars_base_external_illuminance': rng.integers(500, 716, count, dtype=np.int32),
+                'mars_base_internal_co2': np.round(rng.uniform(0.02, 0.1, count), 3),
+                'mars_base_internal_oxygen': np.round(rng.uniform(4.0, 7.0, count), 1),
+            }
+
+        rng = random.Random(seed)
+        return {
+            'mars_base_internal_temperature': array('i', rng.choices(range(18, 31), k=count)),
+            'mars_base_external_temperature': array('i', rng.choices(range(0, 22), k=count)),
+            'mars_base_internal_humidity': array('i', rng.choices(range(50, 61), k=count)),
+            'mars_base_external_illuminance': array('i', rng.choices(range(500, 716), k=count)),
+            'mars_base_internal_co2': array('d', [round(rng.uniform(0.02, 0.1), 3) for _ in range(count)]),
+            'mars_base_internal_oxygen': array('d', [round(rng.uniform(4.0, 7.0), 1) for _ in range(count)]),
+        }
+
     def get_env(self):
         self.set_env()
         return self.env_values
 
+# 최근 size 개의 값만 고정 크기 링 버퍼에 보관하면서 합계와 제곱합을 계속 갱신한다.
+# 최솟값/최댓값은 단조 덱으로 관리하므로 평균, 최솟값, 최댓값, 표준편차를 언제든 O(1) 로 구할 수 있다.
+class RollingWindow:
+    def __init__(self, size):
+        self.size = size
+        self.values = array('d', [0.0]) * size
+        self.count = 0
+        self.index = 0
+        self.sequence = 0
+        self.total = 0.0
+        self.total_squares = 0.0
+        self.min_candidates = deque()
+        self.max_candidates = deque()
+
+    def add(self, value):
+        value = float(value)
+        if self.count == self.size:
+            old = self.values[self.index]
+            self.total -= old
+            self.total_squares -= old * old
+        else:
+            self.count += 1
+
+        self.values[self.index] = value
+        self.total += value
+        self.total_squares += value * value
+        self.index = (self.index + 1) % self.size
+
+        # 한 바퀴 돌 때마다 합계를 다시 계산해서 부동소수점 오차가 쌓이지 않게 한다.
+        if self.index == 0:
+            self.total = math.fsum(self.values[:self.count])
+            self.total_squares = math.fsum(v * v for v in self.values[:self.count])
+
+        sequence = self.sequence
+        self.sequence += 1
+        expired = sequence - self.size
+        while self.min_candidates and self.min_candidates[-1][1] >= value:
+            self.min_candidates.pop()
+        self.min_candidates.append((sequence, value))
+        if self.min_candidates[0][0] <= expired:
+            self.min_candidates.popleft()
+        while self.max_candidates and self.max_candidates[-1][1] <= value:
+            self.max_candidates.pop()
+        self.max_candidates.append((sequence, value))
+        if self.max_candidates[0][0] <= expired:
+            self.max_candidates.popleft()
+
+    def average(self):
+        return self.total / self.count if self.count else 0.0
+
+    def minimum(self):
+        return self.min_candidates[0][1] if self.count else 0.0
+
+    def maximum(self):
+        return self.max_candidates[0][1] if self.count else 0.0
+
+    def stddev(self):
+        if not self.count:
+            return 0.0
+        mean = self.total / self.count
+        return math.sqrt(max(self.total_squares / self.count - mean * mean, 0.0))
+
+def format_time(seconds=None):
+    t = time.localtime(seconds)
+    return f'{t.tm_year}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}'
+
+# 열려 있는 로그 파일. 파일마다 atexit 에 등록하지 않고 종료 시 한 번에 닫는다.
+OPEN_WRITERS = set()
+
+def close_open_writers():
+    for writer in list(OPEN_WRITERS):
+        writer.close()
+
+atexit.register(close_open_writers)
+
+# 센서 측정값을 고정 폭 이진 레코드로 추가만 하는 로그.
+# 파일은 한 번만 열고, buffer_records 개가 모이거나 flush_interval 초가 지나면 한 번에 쓴다.
+# close() 나 종료 시에도 남은 레코드를 기록한다.
+class SensorLogWriter:
+    magic = SENSOR_LOG_MAGIC
+    record_struct = SENSOR_RECORD
+
+    def __init__(self, filename, buffer_records=256, flush_interval=1.0):
+        self.filename = filename
+        self.buffer_records = buffer_records
+        self.flush_interval = flush_interval
+        self.buffer = bytearray()
+        self.buffered = 0
+        self.last_flush = time.monotonic()
+        self.file = open(filename, 'ab')
+        if self.file.tell() == 0:
+            # 헤더는 바로 디스크로 내보내서, 첫 레코드를 쓰기 전에 끝나도 빈 파일이 남지 않게 한다.
+            self.file.write(SENSOR_LOG_HEADER.pack(self.magic, SENSOR_LOG_VERSION, self.record_struct.size))
+            self.file.flush()
+        OPEN_WRITERS.add(self)
+
+    def append(self, seconds, env_values):
+        self.write_record(self.record_struct.pack(round(seconds * 1000), *(env_values[key] for key in SENSOR_KEYS)))
+
+    def write_record(self, record):
+        self.buffer += record
+        self.buffered += 1
+        if self.buffered >= self.buffer_records or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer.clear()
+            self.buffered = 0
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+        OPEN_WRITERS.discard(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# 이진 센서 로그를 mmap 으로 열어서 읽는 클래스.
+# 레코드는 시간순으로 추가되므로 시각 구간 질의는 이진 탐색으로 시작 위치를 찾는다.
+class SensorLogReader:
+    magic = SENSOR_LOG_MAGIC
+    record_struct = SENSOR_RECORD
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        # 헤더도 다 쓰기 전에 끝난 파일은 레코드가 없는 로그로 본다. (빈 파일은 mmap 할 수 없다)
+        self.mm = None
+        self.count = 0
+        if os.fstat(self.file.fileno()).st_size < SENSOR_LOG_HEADER.size:
+            return
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self.file.close()
+            raise
+
+        magic, version, record_size = SENSOR_LOG_HEADER.unpack_from(self.mm, 0)
+        if magic != self.magic or version != SENSOR_LOG_VERSION or record_size != self.record_struct.size:
+            self.close()
+            raise ValueError(f'{filename} 은(는) 센서 로그 파일이 아닙니다.')
+
+        # 쓰는 도중 끊겨서 남은 불완전한 마지막 레코드는 무시한다.
+        self.count = (len(self.mm) - SENSOR_LOG_HEADER.size) // self.record_struct.size
+
+    def __len__(self):
+        return self.count
+
+    def timestamp_ms(self, index):
+        return struct.unpack_from('<q', self.mm, SENSOR_LOG_HEADER.size + index * self.record_struct.size)[0]
+
+    def record(self, index):
+        timestamp_ms, *values = self.record_struct.unpack_from(self.mm, SENSOR_LOG_HEADER.size + index * self.record_struct.size)
+        return timestamp_ms / 1000, dict(zip(SENSOR_KEYS, values))
+
+    def records(self, start=0, stop=None):
+        for index in range(start, self.count if stop is None else stop):
+            yield self.record(index)
+
+    # start 이상 end 미만 시각(epoch 초)의 레코드
+    def between(self, start, end):
+        timestamps = TimestampView(self)
+        first = bisect.bisect_left(timestamps, round(start * 1000))
+        last = bisect.bisect_left(timestamps, round(end * 1000), first)
+        return self.records(first, last)
+
+    def close(self):
+        if self.mm is not None and not self.mm.closed:
+            self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# bisect 가 레코드의 시각만 읽을 수 있도록 감싼 시퀀스
+class TimestampView:
+    def __init__(self, reader):
+        self.reader = reader
+
+    def __len__(self):
+        return self.reader.count
+
+    def __getitem__(self, index):
+        return self.reader.timestamp_ms(index)
+
+# 보존 엔진(SensorHistory)의 raw 구간 파일들을 시간순으로 읽어서 기존 sensor_log.txt 와 같은 텍스트 형식으로 내보낸다.
+# base 는 SensorHistory 와 같은 파일 이름 앞부분이며, [Count n] 은 모든 구간에 걸쳐 이어서 센다.
+def export_sensor_log_text(base='sensor_log', text_filename='sensor_log.txt'):
+    count = 0
+    with open(text_filename, 'w') as text_file:
+        for segment_start, path in SensorHistory(base).segments('raw'):
+            with SensorLogReader(path) as reader:
+                for seconds, env_values in reader.records():
+                    count += 1
+                    text_file.write(MissionComputer.format_log_entry(count, format_time(seconds), env_values))
+    return count
+
+# 일정 구간(bucket)의 측정값을 합친 집계. 환경값마다 평균, 최솟값, 최댓값과 측정 횟수를 가진다.
+class Aggregate:
+    __slots__ = ('start', 'count', 'sums', 'mins', 'maxs')
+
+    def __init__(self, start):
+        self.start = start
+        self.count = 0
+        self.sums = [0.0] * len(SENSOR_KEYS)
+        self.mins = [math.inf] * len(SENSOR_KEYS)
+        self.maxs = [-math.inf] * len(SENSOR_KEYS)
+
+    def add_sample(self, env_values):
+        self.count += 1
+        for i, key in enumerate(SENSOR_KEYS):
+            value = env_values[key]
+            self.sums[i] += value
+            if value < self.mins[i]:
+                self.mins[i] = value
+            if value > self.maxs[i]:
+                self.maxs[i] = value
+
+    def merge(self, other):
+        self.count += other.count
+        for i in range(len(SENSOR_KEYS)):
+            self.sums[i] += other.sums[i]
+            self.mins[i] = min(self.mins[i], other.mins[i])
+            self.maxs[i] = max(self.maxs[i], other.maxs[i])
+
+    def summary(self):
+        return {
+            key: {
+                'mean': self.sums[i] / self.count if self.count else 0.0,
+                'min': self.mins[i],
+                'max': self.maxs[i],
+                'count': self.count,
+            }
+            for i, key in enumerate(SENSOR_KEYS)
+        }
+
+    def pack(self):
+        means = [total / self.count if self.count else 0.0 for total in self.sums]
+        return AGGREGATE_RECORD.pack(self.start * 1000, self.count, *means, *self.mins, *self.maxs)
+
+    @classmethod
+    def unpack(cls, start_ms, count, *values):
+        size = len(SENSOR_KEYS)
+        aggregate = cls(start_ms // 1000)
+        aggregate.count = count
+        aggregate.sums = [mean * count for mean in values[:size]]
+        aggregate.mins = list(values[size:2 * size])
+        aggregate.maxs = list(values[2 * size:])
+        return aggregate
+
+class AggregateLogWriter(SensorLogWriter):
+    magic = AGGREGATE_LOG_MAGIC
+    record_struct = AGGREGATE_RECORD
+
+    def append(self, aggregate):
+        self.write_record(aggregate.pack())
+
+class AggregateLogReader(SensorLogReader):
+    magic = AGGREGATE_LOG_MAGIC
+    record_struct = AGGREGATE_RECORD
+
+    def record(self, index):
+        values = self.record_struct.unpack_from(self.mm, SENSOR_LOG_HEADER.size + index * self.record_struct.size)
+        return Aggregate.unpack(*values)
+
+# 센서 기록 보존 엔진.
+# - raw: 5초 측정값을 raw_retention 초 동안 보관 (1시간 단위 파일)
+# - 1m: 1분 집계를 minute_retention 초 동안 보관 (1일 단위 파일)
+# - 1h: 1시간 집계를 hour_retention 초 동안 보관 (30일 단위 파일, None 이면 계속 보관)
+# 구간이 끝날 때마다 상위 단계로 집계를 넘기고, 보존 기간이 지난 파일은 통째로 지우므로 디스크 사용량이 일정하게 유지된다.
+class SensorHistory:
+    def __init__(self, base='sensor_log', raw_retention=DAY_SECONDS,
+                 minute_retention=30 * DAY_SECONDS, hour_retention=None):
+        self.base = base
+        self.retention = {'raw': raw_retention, '1m': minute_retention, '1h': hour_retention}
+        self.writers = {}
+        self.segment_starts = {}
+        self.pending = {'1m': None, '1h': None}
+        self.latest = None
+
+    def segment_path(self, tier, segment_start):
+        return f'{self.base}.{tier}.{segment_start}.bin'
+
+    def segments(self, tier):
+        prefix = f'{os.path.basename(self.base)}.{tier}.'
+        directory = os.path.dirname(self.base) or '.'
+        segments = []
+        for filename in os.listdir(directory):
+            if filename.startswith(prefix) and filename.endswith('.bin'):
+                segment_start = filename[len(prefix):-len('.bin')]
+                if segment_start.isdigit():
+                    segments.append((int(segment_start), os.path.join(directory, filename)))
+        return sorted(segments)
+
+    # seconds 가 속한 tier 구간의 시작 시각. 새 구간으로 넘어가면 보존 기간이 지난 파일을 정리한다.
+    def segment_start(self, tier, seconds):
+        segment_seconds = HISTORY_SEGMENTS[tier]
+        segment_start = int(seconds) // segment_seconds * segment_seconds
+        if self.segment_starts.get(tier) != segment_start:
+            self.segment_starts[tier] = segment_start
+            self.prune(tier, seconds)
+        return segment_start
+
+    # raw 단계만 파일을 열어 둔다. 집계 단계는 1분에 한 번 쓰므로 쓸 때마다 열고 닫아서
+    # 센서가 많아도 센서 하나당 파일 디스크립터를 하나만 사용한다.
+    def writer(self, tier, seconds):
+        segment_start = self.segment_start(tier, seconds)
+        current = self.writers.get(tier)
+        if current is not None and current[0] == segment_start:
+            return current[1]
+
+        if current is not None:
+            current[1].close()
+        writer = SensorLogWriter(self.segment_path(tier, segment_start))
+        self.writers[tier] = (segment_start, writer)
+        return writer
+
+    # 보존 기간보다 오래된 구간 파일을 삭제한다.
+    def prune(self, tier, now):
+        retention = self.retention[tier]
+        if retention is None:
+            return
+        segment_seconds = HISTORY_SEGMENTS[tier]
+        for segment_start, path in self.segments(tier):
+            if segment_start + segment_seconds <= now - retention:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def add(self, seconds, env_values):
+        self.latest = seconds if self.latest is None else max(self.latest, seconds)
+        self.writer('raw', seconds).append(seconds, env_values)
+
+        sample = Aggregate(int(seconds))
+        sample.add_sample(env_values)
+        self.roll_up('1m', sample)
+
+    # 집계를 tier 의 현재 구간에 합친다. 구간이 바뀌면 끝난 구간을 기록하고 상위 단계로 넘긴다.
+    def roll_up(self, tier, aggregate):
+        width = HISTORY_BUCKETS[tier]
+        bucket = aggregate.start // width * width
+        current = self.pending[tier]
+        if current is not None and current.start != bucket:
+            self.emit(tier, current)
+            current = None
+        if current is None:
+            current = self.pending[tier] = Aggregate(bucket)
+        current.merge(aggregate)
+
+    def emit(self, tier, aggregate):
+        path = self.segment_path(tier, self.segment_start(tier, aggregate.start))
+        with AggregateLogWriter(path) as writer:
+            writer.append(aggregate)
+        if tier == '1m':
+            self.roll_up('1h', aggregate)
+
+    # 조회 구간의 길이에 맞춰 읽을 단계를 고른다. 긴 구간일수록 거친 집계를 읽는다.
+    def choose_tier(self, start, end):
+        now = self.latest if self.latest is not None else time.time()
+        span = end - start
+        for tier in ('raw', '1m'):
+            retention = self.retention[tier]
+            covered = retention is None or start >= now - retention
+            if span <= HISTORY_QUERY_SPANS[tier] and covered:
+                return tier
+        return '1h'
+
+    # start 이상 end 미만 구간의 기록.
+    # raw 단계는 (시각, 측정값), 집계 단계는 (구간 시작 시각, 환경값별 {mean, min, max, count}) 를 돌려준다.
+    def query(self, start, end, tier=None):
+        tier = tier or self.choose_tier(start, end)
+        self.flush()
+
+        if tier == 'raw':
+            results = []
+            for segment_start, path in self.segments('raw'):
+                if segment_start + HISTORY_SEGMENTS['raw'] <= start or segment_start >= end:
+                    continue
+                with SensorLogReader(path) as reader:
+                    results.extend(reader.between(start, end))
+            return results
+
+        # 재시작 등으로 같은 구간이 두 번 기록되었으면 하나로 합친다.
+        merged = []
+        aggregates = []
+        for segment_start, path in self.segments(tier):
+            if segment_start + HISTORY_SEGMENTS[tier] <= start or segment_start >= end:
+                continue
+            with AggregateLogReader(path) as reader:
+                aggregates.extend(reader.between(start, end))
+        pending = self.pending[tier]
+        if pending is not None and start <= pending.start < end:
+            aggregates.append(pending)
+        for aggregate in aggregates:
+            if merged and merged[-1].start == aggregate.start:
+                merged[-1].merge(aggregate)
+            else:
+                copy = Aggregate(aggregate.start)
+                copy.merge(aggregate)
+                merged.append(copy)
+        return [(aggregate.start, aggregate.summary()) for aggregate in merged]
+
+    def flush(self):
+        for segment_start, writer in self.writers.values():
+            writer.flush()
+
+    # 진행 중인 구간의 집계도 기록하고 파일을 닫는다.
+    def close(self):
+        for tier in ('1m', '1h'):
+            aggregate = self.pending[tier]
+            self.pending[tier] = None
+            if aggregate is not None and aggregate.count:
+                self.emit(tier, aggregate)
+        for segment_start, writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
 # 미션 컴퓨터에 해당하는 클래스를 생성한다. 클래스의 이름은 MissionComputer로 정의한다. 
 class MissionComputer():
 
@@ -41,27 +558,54 @@ class MissionComputer():
 
         # 문제 3에서 제작한 DummySensor 클래스를 ds라는 이름으로 인스턴스화 시킨다. 
         self.ds = DummySensor()
-        self.collected_data = []
 
-    def get_time(self):
-        t = time.localtime()
-        return f'{t.tm_year}-{t.tm_mon:02d}-{t.tm_mday:02d} {t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}'
+        # 센서마다 환경값별 구간 이동 통계를 따로 유지한다. 오래 실행해도 메모리 사용량은 일정하다.
+        # {센서 이름: {환경값: {구간 이름: RollingWindow}}}
+        self.rolling = {}
 
-    def average_env(self):
-        if not self.collected_data:
-            return
+    def get_time(self, seconds=None):
+        return format_time(seconds)
 
-        avg = {}
-        keys = self.collected_data[0].keys()
+    # 구간의 크기는 측정 횟수이므로 센서마다 자기 측정 주기로 나눠서 정한다.
+    def sensor_windows(self, name, interval):
+        windows = self.rolling.get(name)
+        if windows is None:
+            windows = self.rolling[name] = {
+                key: {
+                    window: RollingWindow(max(1, round(seconds / interval)))
+                    for window, seconds in ROLLING_WINDOWS.items()
+                }
+                for key in SENSOR_KEYS
+            }
+        return windows
 
-        for key in keys:
-            # float으로 명시적 변환
-            values = [float(data.get(key, 0)) for data in self.collected_data]
-            total = sum(values)
-            average = total / len(values)
-            avg[key] = round(average, 3)
+    def record_env(self, env_values, name=DEFAULT_SENSOR, interval=SAMPLE_INTERVAL):
+        windows = self.sensor_windows(name, interval)
+        for key, value in env_values.items():
+            for window in windows[key].values():
+                window.add(value)
+
+    # 센서 name 의 window 구간 환경값별 평균, 최솟값, 최댓값, 표준편차
+    def get_statistics(self, window='5m', name=DEFAULT_SENSOR):
+        return {
+            key: {
+                'average': round(windows[window].average(), 3),
+                'min': windows[window].minimum(),
+                'max': windows[window].maximum(),
+                'stddev': round(windows[window].stddev(), 3),
+            }
+            for key, windows in self.rolling.get(name, {}).items()
+        }
 
-        print('\n[5분 평균 환경 데이터]')
+    def get_averages(self, window='5m', name=DEFAULT_SENSOR):
+        windows = self.rolling.get(name)
+        if not windows or not windows[SENSOR_KEYS[0]][window].count:
+            return {}
+        return {key: round(key_windows[window].average(), 3) for key, key_windows in windows.items()}
+
+    def report_averages(self, avg, name=None):
+        title = '[5분 평균 환경 데이터]' + (f' {name}' if name else '')
+        print(f'\n{title}')
         print('{')
         for idx, (key, value) in enumerate(avg.items()):
             comma = ',' if idx < len(avg) - 1 else ''
@@ -69,52 +613,167 @@ class MissionComputer():
         print('}\n')
 
         with open('sensor_log.txt', 'a') as log_file:
-            log_file.write('[5분 평균 환경 데이터]\n')
+            log_file.write(f'{title}\n')
             for key, value in avg.items():
                 log_file.write(f'{key}: {value}\n')
             log_file.write('\n')
 
-        self.collected_data.clear()
+    def average_env(self, window='5m', name=DEFAULT_SENSOR):
+        avg = self.get_averages(window, name)
+        if avg:
+            self.report_averages(avg)
+
+    def print_env(self, env_values):
+        print('{')
+        for idx, (key, value) in enumerate(env_values.items()):
+            comma = ',' if idx < len(env_values) - 1 else ''
+            print(f"    '{key}': {repr(value)}{comma}")
+        print('}')
+
+    @staticmethod
+    def format_log_entry(count, timestamp, env_values, name=None):
+        header = f'[Count {count}] {timestamp}' + (f' {name}' if name else '')
+        lines = [header] + [f'{key}: {value}' for key, value in env_values.items()]
+        return '\n'.join(lines) + '\n\n'
 
     # MissionComputer에 get_sensor_data() 메소드를 추가한다. 
     # get_sensor_data() 메소드에 다음과 같은 세 가지 기능을 추가한다.
+    # 측정값은 보존 엔진(SensorHistory)의 이진 로그에 기록하고, 텍스트는 export_sensor_log_text() 로 만든다.
     def get_sensor_data(self):
         count = 0
+        history = SensorHistory()
         try:
             while True:
                 sensor_data = self.ds.get_env()
                 self.env_values = sensor_data
-                self.collected_data.append(sensor_data.copy())
+                self.record_env(sensor_data)
 
                 count += 1
-                timestamp = self.get_time()
 
-                print('{')
-                for idx, (key, value) in enumerate(self.env_values.items()):
-                    comma = ',' if idx < len(self.env_values) - 1 else ''
-                    print(f"    '{key}': {repr(value)}{comma}")
-                print('}')
+                self.print_env(self.env_values)
 
-                with open('sensor_log.txt', 'a') as log_file:
-                    log_file.write(f'[Count {count}] {timestamp}\n')
-                    for key, value in self.env_values.items():
-                        log_file.write(f'{key}: {value}\n')
-                    log_file.write('\n')
+                history.add(time.time(), self.env_values)
 
                 # 5분에 한번씩 각 환경값에 대한 5분 평균 값을 별도로 출력한다. 
-                if count % 60 == 0:
+                if count % (ROLLING_WINDOWS['5m'] // SAMPLE_INTERVAL) == 0:
                     self.average_env()
 
-                time.sleep(5)
+                time.sleep(SAMPLE_INTERVAL)
 
         # 특정 키를 입력할 경우 반복적으로 출력되던 화성 기지의 환경에 대한 출력을 멈추고 ‘Sytem stoped….’ 를 출력 할 수 있어야 한다. 
         # Ctrl + c
         except KeyboardInterrupt:
             print('\nSystem stopped....')
+        finally:
+            history.close()
+
+    # 센서 하나를 interval 초마다 읽어서 모든 소비자 큐에 넣는다.
+    # 읽는 시각은 처리 시간과 상관없이 일정한 간격을 유지하고, 큐에는 기다리지 않고 바로 넣는다.
+    async def sample_sensor(self, name, sensor, interval, queues):
+        loop = asyncio.get_running_loop()
+        next_time = loop.time()
+        while True:
+            reading = (name, time.time(), dict(sensor.get_env()))
+            for queue in queues:
+                put_latest(queue, reading)
+
+            next_time += interval
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+    # 콘솔 출력은 별도 스레드에서 처리해서 느린 콘솔이 이벤트 루프를 막지 않게 한다.
+    async def print_consumer(self, queue):
+        while True:
+            name, timestamp, env_values = await queue.get()
+            await asyncio.to_thread(self.print_env, env_values)
+
+    # 쌓여 있는 측정값을 한꺼번에 모아서 별도 스레드에서 보존 엔진의 이진 로그에 쓴다.
+    # 센서가 여러 개이면 센서마다 sensor_log.<이름> 으로 시작하는 파일을 사용한다.
+    # 취소되어도 쓰고 있던 묶음은 끝까지 쓰게 하고(shield), 그 스레드가 끝난 뒤에 파일을 닫는다.
+    async def log_consumer(self, queue, multiple_sensors):
+        histories = {}
+        write = None
+        try:
+            while True:
+                readings = [await queue.get()]
+                while not queue.empty():
+                    readings.append(queue.get_nowait())
+                write = asyncio.ensure_future(
+                    asyncio.to_thread(self.write_readings, histories, readings, multiple_sensors))
+                await asyncio.shield(write)
+        finally:
+            if write is not None and not write.done():
+                await asyncio.wait([write])
+            for history in histories.values():
+                history.close()
+
+    def write_readings(self, histories, readings, multiple_sensors):
+        for name, seconds, env_values in readings:
+            history = histories.get(name)
+            if history is None:
+                history = histories[name] = SensorHistory(f'sensor_log.{name}' if multiple_sensors else 'sensor_log')
+            history.add(seconds, env_values)
+
+    # 측정값을 센서별 이동 통계에 반영하고, 5분마다 센서별 평균을 별도 스레드에서 출력/기록한다.
+    # intervals 는 {센서 이름: 주기(초)} 이며, 구간에 담을 측정 횟수를 정하는 데 쓴다.
+    async def average_consumer(self, queue, intervals):
+        loop = asyncio.get_running_loop()
+        next_report = loop.time() + ROLLING_WINDOWS['5m']
+        while True:
+            name, timestamp, env_values = await queue.get()
+            self.env_values = env_values
+            self.record_env(env_values, name, intervals.get(name, SAMPLE_INTERVAL))
+
+            if loop.time() >= next_report:
+                next_report += ROLLING_WINDOWS['5m']
+                multiple_sensors = len(intervals) > 1
+                for sensor_name in list(self.rolling):
+                    avg = self.get_averages(name=sensor_name)
+                    if avg:
+                        await asyncio.to_thread(self.report_averages, avg, sensor_name if multiple_sensors else None)
+
+    # 여러 센서를 각자의 주기로 동시에 읽고, 출력/기록/평균 계산은 각각의 소비자가 큐에서 꺼내 처리한다.
+    # sensors 는 {이름: (센서, 주기(초))} 형태이며, 주지 않으면 기본 DummySensor 하나를 사용한다.
+    async def sample_async(self, sensors=None, queue_size=QUEUE_SIZE):
+        if sensors is None:
+            sensors = {DEFAULT_SENSOR: (self.ds, SAMPLE_INTERVAL)}
+        intervals = {name: interval for name, (sensor, interval) in sensors.items()}
+
+        print_queue = asyncio.Queue(queue_size)
+        log_queue = asyncio.Queue(queue_size)
+        average_queue = asyncio.Queue(queue_size)
+        queues = (print_queue, log_queue, average_queue)
+
+        tasks = [
+            asyncio.create_task(self.print_consumer(print_queue)),
+            asyncio.create_task(self.log_consumer(log_queue, len(sensors) > 1)),
+            asyncio.create_task(self.average_consumer(average_queue, intervals)),
+        ]
+        tasks += [
+            asyncio.create_task(self.sample_sensor(name, sensor, interval, queues))
+            for name, (sensor, interval) in sensors.items()
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def run_sampler(self, sensors=None):
+        try:
+            asyncio.run(self.sample_async(sensors))
+        except KeyboardInterrupt:
+            print('\nSystem stopped....')
+
+# 큐가 가득 차 있으면 가장 오래된 값을 버리고 새 값을 넣는다. (센서 읽기가 소비자를 기다리지 않도록)
+def put_latest(queue, item):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
 
 if __name__ == '__main__':
     # MissionComputer 클래스를 RunComputer 라는 이름으로 인스턴스화 한다.  
     RunComputer = MissionComputer()
 
-    # RunComputer 인스턴스의 get_sensor_data() 메소드를 호출해서 지속적으로 환경에 대한 값을 출력 할 수 있도록 한다.
-    RunComputer.get_sensor_data()
+    # RunComputer 인스턴스의 센서를 비동기로 읽어서 지속적으로 환경에 대한 값을 출력 할 수 있도록 한다.
+    # 기존의 한 스레드 방식은 RunComputer.get_sensor_data() 로 그대로 사용할 수 있다.
+    RunComputer.run_sampler()
@@ -1,15 +1,26 @@
 import subprocess
 import platform
 import json
+import os
+import sys
+import threading
+import time
+import argparse
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
 class MissionComputer:
     
-    def __init__(self):
+    def __init__(self, load_interval=1.0):
         self.os_name = ''
         self.os_version = ''
         self.cpu_type = ''
         self.cpu_cores = ''
         self.memory_size = ''
+        self.static_info = {}
+        self.load_interval = load_interval  # 리눅스 부하 측정 주기 (초)
+        self.load_sampler = None
         self.info_settings, self.load_settings = self.load_settings()
 
     def is_unix_like(self):
@@ -44,20 +55,32 @@ class MissionComputer:
         
         return info_settings, load_settings
 
+    # OS, CPU, 전체 메모리처럼 실행 중에 바뀌지 않는 값은 처음 한 번만 구해서 저장해 둔다.
+    def cached(self, key, getter):
+        if key not in self.static_info:
+            self.static_info[key] = getter()
+        return self.static_info[key]
+
     def get_os_name(self):
-        return platform.system() 
+        return self.cached('OS', platform.system)
     
     def get_os_version(self):
-        return platform.version()  # 운영 체제 버전
+        return self.cached('OS Version', platform.version)  # 운영 체제 버전
     
     def get_cpu_type(self):
-        return platform.processor()  # CPU 정보
+        # 리눅스에서는 platform.processor() 가 비어 있는 경우가 많아서 /proc/cpuinfo 의 모델명을 사용한다.
+        if self.is_unix_like():
+            return self.cached('CPU Type', lambda: read_cpu_model_linux() or platform.processor())
+        return self.cached('CPU Type', platform.processor)  # CPU 정보
 
     def get_cpu_cores(self):
-        # platform 모듈에서 CPU 코어 수를 제공하지 않으므로, os나 subprocess를 사용해 CPU 코어 수를 얻는 방법이 필요할 수 있습니다.
-        return platform.machine()  # 예시로 머신 아키텍처 (x86_64 등) 반환
+        # 논리 코어 수 (하이퍼스레딩 포함)
+        return self.cached('CPU Cores', os.cpu_count)
     
     def get_memory_size(self):
+        return self.cached('Memory Size', self.read_memory_size)
+
+    def read_memory_size(self):
         if self.is_windows():
             try:
                 output = subprocess.getoutput("wmic computersystem get TotalPhysicalMemory")
@@ -74,12 +97,11 @@ class MissionComputer:
             return "Unable to retrieve memory size."
         
         elif self.is_unix_like():
+            # 프로세스를 띄우지 않고 /proc/meminfo 를 직접 읽는다.
             try:
-                output = subprocess.getoutput("free -b | grep Mem | awk '{ print $2 }'")
-                if output.strip().isdigit():
-                    mem_bytes = int(output.strip())
-                    mem_gb = round(mem_bytes / (1024 ** 3), 2)
-                    return f"{mem_gb} GB"
+                mem_bytes = read_meminfo_linux()['MemTotal']
+                mem_gb = round(mem_bytes / (1024 ** 3), 2)
+                return f"{mem_gb} GB"
             except Exception:
                 pass
             return "Unable to retrieve memory size."
@@ -89,6 +111,9 @@ class MissionComputer:
     # 1. 파이썬 코드를 사용해서 다음과 같은 미션 컴퓨터의 정보를 알아보는 메소드를 get_mission_computer_info()
     #    라는 이름으로 만들고 문제 7에서 완성한 MissionComputer 클래스에 추가한다. 
     def get_mission_computer_info(self):
+        return json.dumps(self.collect_info(), indent=4)
+
+    def collect_info(self):
         info = {}
         
         if 'OS' in self.info_settings:
@@ -102,26 +127,152 @@ class MissionComputer:
         if 'Memory Size' in self.info_settings:
             info['Memory Size'] = self.get_memory_size()
         
-        return json.dumps(info, indent=4)
+        return info
     
     # 3. 미션 컴퓨터의 부하를 가져오는 코드를 get_mission_computer_load() 메소드로 만들고 MissionComputer 클래스에 추가한다.
     # 4. get_mission_computer_load() 메소드의 경우 다음과 같은 정보들을 가져 올 수 있게한다.
+    # 리눅스에서는 백그라운드 스레드(LoadSampler)가 주기적으로 측정한 최신 값을 읽기만 한다.
+    # 처음 호출할 때만 첫 측정이 끝날 때까지 한 주기 정도 기다린다.
+    def get_linux_load_snapshot(self):
+        if self.load_sampler is None:
+            self.load_sampler = LoadSampler(self.load_interval)
+            self.load_sampler.start()
+        return self.load_sampler.latest(timeout=self.load_interval * 2)
+
+    # 부하 값을 숫자(%)로 구한다. 구할 수 없는 값은 None 이다.
+    def get_load_values(self):
+        values = {'CPU Usage': None, 'CPU Usage Per Core': None, 'Memory Usage': None}
+
+        if self.is_windows():
+            values['CPU Usage'] = parse_percent(get_cpu_usage_windows())
+            values['Memory Usage'] = parse_percent(get_memory_usage_windows())
+        elif self.is_unix_like():
+            snapshot = self.get_linux_load_snapshot()
+            if snapshot is not None:
+                values['CPU Usage'] = snapshot['cpu']
+                values['CPU Usage Per Core'] = snapshot['cores']
+                values['Memory Usage'] = snapshot['memory']
+
+        return values
+
     def get_mission_computer_load(self):
+        values = self.get_load_values()
+
         cpu_usage = "Unable to retrieve CPU usage."
         memory_usage = "Unable to retrieve memory usage."
-
-        if self.is_windows():
-            cpu_usage = get_cpu_usage_windows()
-            memory_usage = get_memory_usage_windows()
+        cpu_usage_per_core = "Unable to retrieve CPU usage."
+        if values['CPU Usage'] is not None:
+            cpu_usage = f"{round(values['CPU Usage'])}%"
+        if values['CPU Usage Per Core'] is not None:
+            cpu_usage_per_core = [f"{round(usage)}%" for usage in values['CPU Usage Per Core']]
+        if values['Memory Usage'] is not None:
+            memory_usage = f"{values['Memory Usage']:.2f}%"
 
         load = {}
         if 'CPU Usage' in self.load_settings:
             load['CPU Usage'] = cpu_usage
+        # setting.txt 의 [load] 에 'CPU Usage Per Core' 를 추가하면 코어별 사용률도 출력한다.
+        if 'CPU Usage Per Core' in self.load_settings:
+            load['CPU Usage Per Core'] = cpu_usage_per_core
         if 'Memory Usage' in self.load_settings:
             load['Memory Usage'] = memory_usage
 
         return json.dumps(load, indent=4)
 
+# "12%", "45.30%" 같은 문자열을 숫자로 바꾼다. 숫자가 아니면 None
+def parse_percent(text):
+    try:
+        return float(text.rstrip("%"))
+    except (AttributeError, ValueError):
+        return None
+
+# /proc/stat 의 cpu 줄들을 {이름: [user, nice, system, idle, iowait, irq, softirq, steal]} 로 읽는다.
+def read_cpu_times_linux(path='/proc/stat'):
+    cpu_times = {}
+    with open(path, "r") as f:
+        for line in f:
+            if not line.startswith("cpu"):
+                break
+            fields = line.split()
+            cpu_times[fields[0]] = [int(value) for value in fields[1:9]]
+    return cpu_times
+
+# 두 시점의 CPU 시간 차이로 사용률(%)을 계산한다. idle 과 iowait 을 쉬는 시간으로 본다.
+def cpu_usage_between(previous, current):
+    total = sum(current) - sum(previous)
+    idle = (current[3] + current[4]) - (previous[3] + previous[4])
+    if total <= 0:
+        return 0.0
+    return (total - idle) * 100 / total
+
+# 백그라운드에서 interval 초마다 CPU(전체/코어별)와 메모리 사용률을 측정해 최신 값만 보관하는 스레드
+class LoadSampler(threading.Thread):
+    def __init__(self, interval=1.0):
+        super().__init__(name="LoadSampler", daemon=True)
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.stopped = threading.Event()
+        self.snapshot = None
+
+    def run(self):
+        try:
+            previous = read_cpu_times_linux()
+            while not self.stopped.wait(self.interval):
+                current = read_cpu_times_linux()
+                cores = [name for name in current if name != "cpu" and name in previous]
+                meminfo = read_meminfo_linux()
+                memory_total = meminfo["MemTotal"]
+                memory_available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+
+                snapshot = {
+                    "time": time.time(),
+                    "cpu": cpu_usage_between(previous["cpu"], current["cpu"]),
+                    "cores": [cpu_usage_between(previous[name], current[name]) for name in cores],
+                    "memory": (memory_total - memory_available) * 100 / memory_total,
+                }
+                with self.lock:
+                    self.snapshot = snapshot
+                self.ready.set()
+                previous = current
+        except Exception as e:
+            print(f"Error sampling system load: {e}")
+        finally:
+            # 측정에 실패해도 기다리는 호출자가 멈추지 않게 한다.
+            self.ready.set()
+
+    def latest(self, timeout=None):
+        self.ready.wait(timeout)
+        with self.lock:
+            return self.snapshot
+
+    def stop(self):
+        self.stopped.set()
+
+# /proc/meminfo 의 각 항목을 바이트 단위 정수로 읽는다.
+def read_meminfo_linux(path='/proc/meminfo'):
+    meminfo = {}
+    with open(path, "r") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            fields = rest.split()
+            if fields and fields[0].isdigit():
+                value = int(fields[0])
+                meminfo[key] = value * 1024 if len(fields) > 1 and fields[1] == "kB" else value
+    return meminfo
+
+# /proc/cpuinfo 에서 CPU 모델명을 읽는다. (ARM 등은 모델명 항목 이름이 다르다)
+def read_cpu_model_linux(path='/proc/cpuinfo'):
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key.strip() in ("model name", "Hardware", "Processor", "cpu model") and value.strip():
+                    return value.strip()
+    except OSError:
+        pass
+    return ""
+
 def get_memory_usage_windows():
     try:
         # PowerShell을 통해 전체 사용률 % 계산
@@ -154,9 +305,139 @@ def get_cpu_usage_windows():
         return "Unable to retrieve CPU usage."
 
 
+# setting.txt 의 [info], [load] 항목을 schedule 초마다 측정해서 최근 history_size 개를 메모리에 보관한다.
+# 한 번 측정한 값은 (시각, CPU, 메모리, 코어별 CPU) 튜플로만 저장해서 오래 실행해도 메모리가 일정하다.
+class TelemetryRecorder(threading.Thread):
+    def __init__(self, computer, interval=5.0, history_size=720):
+        super().__init__(name="TelemetryRecorder", daemon=True)
+        self.computer = computer
+        self.interval = interval
+        self.history = deque(maxlen=history_size)
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.info = computer.collect_info()
+
+    def run(self):
+        while True:
+            values = self.computer.get_load_values()
+            cores = values['CPU Usage Per Core']
+            sample = (time.time(), values['CPU Usage'], values['Memory Usage'], tuple(cores) if cores else ())
+            with self.lock:
+                self.history.append(sample)
+            if self.stopped.wait(self.interval):
+                break
+
+    def stop(self):
+        self.stopped.set()
+
+    def samples(self, limit=None):
+        with self.lock:
+            samples = list(self.history)
+        return samples[-limit:] if limit else samples
+
+    def to_json(self, limit=None):
+        load_settings = self.computer.load_settings
+        history = []
+        for timestamp, cpu, memory, cores in self.samples(limit):
+            entry = {"time": timestamp}
+            if 'CPU Usage' in load_settings:
+                entry['CPU Usage'] = cpu
+            if 'CPU Usage Per Core' in load_settings:
+                entry['CPU Usage Per Core'] = list(cores)
+            if 'Memory Usage' in load_settings:
+                entry['Memory Usage'] = memory
+            history.append(entry)
+        return json.dumps({"info": self.info, "latest": history[-1] if history else None, "history": history})
+
+    # Prometheus 텍스트 형식 (최신 측정값만)
+    def to_prometheus(self):
+        load_settings = self.computer.load_settings
+        lines = []
+
+        labels = {key: value for key, value in self.info.items() if key != 'CPU Cores'}
+        if labels:
+            label_text = ",".join(f'{metric_name(key)}="{escape_label(value)}"' for key, value in labels.items())
+            lines += ["# TYPE mission_computer_info gauge", f"mission_computer_info{{{label_text}}} 1"]
+        if isinstance(self.info.get('CPU Cores'), int):
+            lines += ["# TYPE mission_computer_cpu_cores gauge", f"mission_computer_cpu_cores {self.info['CPU Cores']}"]
+
+        samples = self.samples(1)
+        if samples:
+            timestamp, cpu, memory, cores = samples[-1]
+            if 'CPU Usage' in load_settings and cpu is not None:
+                lines += ["# TYPE mission_computer_cpu_usage_percent gauge", f"mission_computer_cpu_usage_percent {cpu:.2f}"]
+            if 'CPU Usage Per Core' in load_settings and cores:
+                lines.append("# TYPE mission_computer_cpu_core_usage_percent gauge")
+                lines += [f'mission_computer_cpu_core_usage_percent{{core="{i}"}} {usage:.2f}' for i, usage in enumerate(cores)]
+            if 'Memory Usage' in load_settings and memory is not None:
+                lines += ["# TYPE mission_computer_memory_usage_percent gauge", f"mission_computer_memory_usage_percent {memory:.2f}"]
+            lines += ["# TYPE mission_computer_last_sample_timestamp_seconds gauge",
+                      f"mission_computer_last_sample_timestamp_seconds {timestamp:.3f}"]
+
+        return "\n".join(lines) + "\n"
+
+def metric_name(text):
+    return "".join(c if c.isalnum() else "_" for c in text.lower())
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+# /metrics 는 Prometheus 텍스트, /telemetry 는 JSON (?limit=N 으로 최근 N 개만) 으로 응답한다.
+class TelemetryHandler(BaseHTTPRequestHandler):
+    recorder = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/metrics":
+            self.respond(self.recorder.to_prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+        elif url.path == "/telemetry":
+            limit = parse_qs(url.query).get("limit", [""])[0]
+            self.respond(self.recorder.to_json(int(limit) if limit.isdigit() else None), "application/json; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def respond(self, body, content_type):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+# 측정 스레드와 로컬 HTTP 서버를 띄워서 Ctrl + c 를 누를 때까지 부하를 계속 제공한다.
+def run_telemetry(computer, host="127.0.0.1", port=9100, interval=5.0, history_size=720):
+    recorder = TelemetryRecorder(computer, interval, history_size)
+    recorder.start()
+
+    handler = type("BoundTelemetryHandler", (TelemetryHandler,), {"recorder": recorder})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Telemetry: http://{host}:{port}/metrics , http://{host}:{port}/telemetry")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nSystem stopped....")
+    finally:
+        server.server_close()
+        recorder.stop()
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--telemetry", action="store_true", help="부하를 계속 측정해서 로컬 HTTP 포트로 제공")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--interval", type=float, default=5.0, help="측정 주기 (초)")
+    parser.add_argument("--history", type=int, default=720, help="메모리에 보관할 측정 개수")
+    args = parser.parse_args()
+
     # 7. MissionComputer 클래스를 runComputer 라는 이름으로 인스턴스화 한다.  
-    runComputer = MissionComputer()
+    runComputer = MissionComputer(load_interval=min(args.interval, 1.0))
+
+    if args.telemetry:
+        run_telemetry(runComputer, args.host, args.port, args.interval, args.history)
+        sys.exit()
 
     # 2. get_mission_computer_info()에 가져온 시스템 정보를 JSON 형식으로 출력하는 코드를 포함한다
     print(runComputer.get_mission_computer_info())
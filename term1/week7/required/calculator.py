@@ -1,14 +1,26 @@
+import os
 import sys
 from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLineEdit
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+from decimal import Decimal
+from fractions import Fraction
+
+# 수식 엔진은 week9 의 expression_engine.py 하나만 두고 함께 사용한다.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'week9', 'required'))
+
+from expression_engine import DEFAULT_PRECISION, ExpressionError, evaluate, format_exact
+
 
 class Calculator(QWidget):
-    def __init__(self):
+    # backend: 'float', 'decimal', 'fraction' 중 하나. precision 은 decimal 방식의 유효 자릿수
+    def __init__(self, backend='float', precision=DEFAULT_PRECISION):
         super().__init__()
         self.setWindowTitle('계산기')
         self.setFixedSize(360, 500)
+        self.backend = backend
+        self.precision = precision
         self.expression = ''
         self.init_ui()
 
@@ -89,8 +101,11 @@ class Calculator(QWidget):
 
     def format_result(self, result, digits=6, max_len=10):
         try:
-            float_result = round(float(result), digits)
-            result = str(float_result)
+            # Decimal, Fraction 결과는 float 을 거치지 않고 반올림한다.
+            if isinstance(result, (Decimal, Fraction)):
+                result = format_exact(result, digits)
+            else:
+                result = str(round(float(result), digits))
             if len(result) > max_len:
                 result = result[:max_len] + '...'
             return result
@@ -103,12 +118,11 @@ class Calculator(QWidget):
             self.display.setText('')
         elif text == '=': # 4칙 연산이 가능하도록 코드를 추가한다. 
             try:
-                expr = self.expression.replace('×', '*').replace('÷', '/').replace('−', '-')
-                raw_result = str(eval(expr))
+                raw_result = evaluate(self.expression, self.backend, self.precision)
                 result = self.format_result(raw_result)
                 self.display.setText(result)
                 self.expression = result
-            except Exception:
+            except (ExpressionError, ArithmeticError):
                 self.display.setText('Error')
                 self.expression = ''
         elif text == '+/-':
@@ -0,0 +1,85 @@
+import random
+import time
+from fractions import Fraction
+
+from expression_engine import BACKENDS, compile_expression, evaluate
+
+# 벤치마크용 수식 수
+EXPRESSION_COUNT = 100000
+
+
+def make_expressions(count, seed=0):
+    rng = random.Random(seed)
+    expressions = []
+    for _ in range(count):
+        terms = [str(rng.randint(1, 999)) if rng.random() < 0.7 else f'{rng.uniform(0, 100):.3f}'
+                 for _ in range(rng.randint(2, 6))]
+        operators = [rng.choice('+−×÷') for _ in range(len(terms) - 1)]
+        expression = terms[0]
+        for operator, term in zip(operators, terms[1:]):
+            expression += operator + term
+        expressions.append(expression)
+    return expressions
+
+
+# 기존 방식: 기호를 바꾼 뒤 eval
+def run_eval(expressions):
+    for expression in expressions:
+        eval(expression.replace('×', '*').replace('÷', '/').replace('−', '-'))
+
+
+def run_engine(expressions, backend='float'):
+    for expression in expressions:
+        try:
+            evaluate(expression, backend)
+        except ZeroDivisionError:
+            pass
+
+
+def measure(run, expressions, *args):
+    start = time.perf_counter()
+    run(expressions, *args)
+    return time.perf_counter() - start
+
+
+# 소수점 아래 6 자리로 반올림했을 때 정확한 유리수(fraction) 결과와 값이 다른 수식 수
+def count_mismatches(expressions, backend, digits=6):
+    mismatches = 0
+    for expression in expressions:
+        try:
+            exact = round(evaluate(expression, 'fraction'), digits)
+        except ZeroDivisionError:
+            continue
+        if round(Fraction(evaluate(expression, backend)), digits) != exact:
+            mismatches += 1
+    return mismatches
+
+
+# 0.1 을 여러 번 더하는 것처럼 오차가 쌓이는 긴 수식
+def make_long_chain(length):
+    return '+'.join(['0.1'] * length) + f'−{length // 10}'
+
+
+if __name__ == '__main__':
+    unique = make_expressions(EXPRESSION_COUNT)
+    # 계산기처럼 같은 수식이 반복되는 경우 (서로 다른 수식 1000개)
+    repeated = [unique[i % 1000] for i in range(EXPRESSION_COUNT)]
+
+    print(f'수식 수: {EXPRESSION_COUNT}')
+    for name, expressions in [('모두 다른 수식', unique), ('반복되는 수식', repeated)]:
+        compile_expression.cache_clear()
+        eval_time = measure(run_eval, expressions)
+        engine_time = measure(run_engine, expressions)
+        print(f'[{name}] eval: {eval_time:.3f}초, 수식 엔진: {engine_time:.3f}초')
+
+    print()
+    print('숫자 방식 비교 (모두 다른 수식)')
+    sample = unique[:10000]
+    for backend in BACKENDS:
+        compile_expression.cache_clear()
+        backend_time = measure(run_engine, unique, backend)
+        print(f'[{backend}] {backend_time:.3f}초, 결과가 정확한 값과 다른 수식: {count_mismatches(sample, backend)}/{len(sample)}')
+
+    chain = make_long_chain(100000)
+    for backend in BACKENDS:
+        print(f'[{backend}] 0.1 을 100000 번 더한 뒤 10000 을 뺀 값: {evaluate(chain, backend)!r}')
@@ -3,12 +3,18 @@ from PyQt5.QtWidgets import QApplication, QWidget, QGridLayout, QPushButton, QLi
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+from calculator_core import calculate, format_result, format_value
+from expression_engine import DEFAULT_PRECISION, ExpressionError, evaluate
+
 
 class Calculator(QWidget):
-    def __init__(self):
+    # backend: 'float', 'decimal', 'fraction' 중 하나. precision 은 decimal 방식의 유효 자릿수
+    def __init__(self, backend='float', precision=DEFAULT_PRECISION):
         super().__init__()
         self.setWindowTitle('계산기')
         self.setFixedSize(360, 500)
+        self.backend = backend
+        self.precision = precision
         self.expression = ''
         self.result_displayed = False
         self.init_ui()
@@ -110,38 +116,26 @@ class Calculator(QWidget):
 
     def percent(self):
         try:
-            result = str(eval(self.expression) / 100)
-            self.expression = result
-            self.update_display(self.format_result(result))
-        except Exception:
+            # 100 으로 나누는 것까지 같은 숫자 방식으로 계산한다. Fraction 은 '1/3' 처럼 수식 형태로 다시 저장된다.
+            value = evaluate(f'({self.expression})/100', self.backend, self.precision)
+            self.expression = str(value)
+            self.update_display(format_value(value))
+        except (ExpressionError, ArithmeticError):
             self.update_display('Error')
             self.expression = ''
 
     def equal(self):
-        try:
-            expr = self.expression.replace('×', '*').replace('÷', '/').replace('−', '-')
-            if '/0' in expr:
-                raise ZeroDivisionError
-            result = str(eval(expr))
-            formatted = self.format_result(result)
-            self.expression = formatted
-            self.update_display(formatted)
-        except ZeroDivisionError:
-            self.update_display('Error')
-            self.expression = ''
-        except Exception:
+        # 계산과 결과 형식은 GUI 없이도 쓸 수 있도록 calculator_core 에 있다.
+        formatted = calculate(self.expression, self.backend, self.precision)
+        if formatted == 'Error':
             self.update_display('Error')
             self.expression = ''
+        else:
+            self.expression = formatted
+            self.update_display(formatted)
 
     def format_result(self, result):
-        try:
-            number = round(float(result), 6)
-            formatted = str(number)
-            if '.' in formatted:
-                formatted = formatted.rstrip('0').rstrip('.') if '.' in formatted else formatted
-            return formatted
-        except Exception:
-            return 'Error'
+        return format_result(result)
 
     def on_click(self, text):
         if self.result_displayed and text.isdigit():
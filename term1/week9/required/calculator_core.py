@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from fractions import Fraction
+from functools import partial
+from itertools import islice
+
+from expression_engine import BACKENDS, DEFAULT_PRECISION, ExpressionError, evaluate, format_exact
+
+# GUI 없이 사용할 수 있는 계산기 핵심 로직
+# - calculate(): 계산기의 '=' 와 같은 결과 문자열을 만든다.
+# - 명령행 모드: 표준 입력이나 파일에서 한 줄에 수식 하나씩 읽어서 결과를 같은 순서로 출력한다.
+#   python calculator_core.py expressions.txt -o results.txt --processes 8
+#   python calculator_core.py expressions.txt --backend decimal --precision 50
+
+# 한 번에 작업자 프로세스로 보내는 수식 수
+BATCH_SIZE = 10000
+
+
+def format_result(result):
+    try:
+        number = round(float(result), 6)
+        formatted = str(number)
+        if '.' in formatted:
+            formatted = formatted.rstrip('0').rstrip('.') if '.' in formatted else formatted
+        return formatted
+    except Exception:
+        return 'Error'
+
+
+# Decimal, Fraction 결과는 float 으로 바꾸면 정확도가 사라지므로 그대로 반올림한다.
+def format_value(value):
+    if isinstance(value, (Decimal, Fraction)):
+        try:
+            return format_exact(value)
+        except (ArithmeticError, ValueError):
+            return 'Error'
+    return format_result(str(value))
+
+
+# 계산기의 '=' 버튼과 같은 규칙으로 계산한다. 계산할 수 없으면 'Error'
+# 괄호가 지나치게 깊게 중첩된 입력(RecursionError)도 일괄 처리 중에 멈추지 않도록 'Error' 로 돌려준다.
+# 0 으로 나누기와 decimal 계산 오류는 모두 ArithmeticError 이다.
+def calculate(expression, backend='float', precision=DEFAULT_PRECISION):
+    try:
+        return format_value(evaluate(expression, backend, precision))
+    except (ExpressionError, ArithmeticError, RecursionError):
+        return 'Error'
+
+
+# 빈 줄은 빈 결과로 두어서 입력과 출력의 줄 번호가 항상 맞도록 한다.
+def calculate_batch(expressions, backend='float', precision=DEFAULT_PRECISION):
+    return [calculate(expression, backend, precision) if expression else '' for expression in expressions]
+
+
+def iter_batches(lines, batch_size):
+    expressions = (line.strip() for line in lines)
+    while True:
+        batch = list(islice(expressions, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+# 여러 프로세스로 나눠 계산하고 입력 순서대로 결과를 돌려준다.
+# 진행 중인 묶음 수를 제한해서 입력이 아무리 커도 메모리를 일정하게 사용한다.
+def calculate_stream(lines, processes=None, batch_size=BATCH_SIZE, backend='float', precision=DEFAULT_PRECISION):
+    batches = iter_batches(lines, batch_size)
+    run_batch = partial(calculate_batch, backend=backend, precision=precision)
+    if processes == 1:
+        for batch in batches:
+            yield from run_batch(batch)
+        return
+
+    max_pending = (processes or os.cpu_count() or 1) * 2
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(run_batch, batch))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='수식을 한 줄에 하나씩 읽어서 계산 결과를 출력합니다.')
+    parser.add_argument('input', nargs='?', help='수식 파일 (생략하면 표준 입력)')
+    parser.add_argument('-o', '--output', help='결과 파일 (생략하면 표준 출력)')
+    parser.add_argument('-p', '--processes', type=int, default=None, help='작업자 프로세스 수 (기본값: CPU 코어 수)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--backend', choices=BACKENDS, default='float', help='숫자 방식 (기본값: float)')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION, help='decimal 방식의 유효 자릿수')
+    args = parser.parse_args(argv)
+
+    try:
+        source = open(args.input, 'r', encoding='utf-8') if args.input else sys.stdin
+    except FileNotFoundError:
+        print(f'Error: {args.input} 파일을 찾을 수 없습니다.')
+        return 1
+    target = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for result in calculate_stream(source, args.processes, args.batch_size, args.backend, args.precision):
+            target.write(result + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import re
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from functools import lru_cache
+
+# 계산기 수식을 eval 없이 계산하는 엔진
+# 1. 토큰 분리: 숫자, 연산자(+ - * / 와 계산기 기호 × ÷ −), 괄호
+# 2. 우선순위 상승(precedence climbing) 파서로 후위 표기 바이트코드로 컴파일
+# 3. 스택 머신으로 바이트코드 실행
+# 같은 수식은 컴파일 결과를 캐시해서 다시 파싱하지 않는다.
+#
+# 숫자 방식(backend)
+# - 'float': 정수는 int, 소수는 float (기본값, 가장 빠름)
+# - 'decimal': decimal.Decimal, precision 자리까지 십진수로 계산
+# - 'fraction': fractions.Fraction, 나눗셈까지 오차 없이 유리수로 계산
+
+OPERATOR_ALIASES = {'×': '*', '÷': '/', '−': '-'}
+BINARY_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+# 바이트코드 명령
+PUSH = 0
+ADD = 1
+SUB = 2
+MUL = 3
+DIV = 4
+NEG = 5
+
+BINARY_OPCODES = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+
+BACKENDS = ('float', 'decimal', 'fraction')
+# decimal 방식의 기본 유효 자릿수 (decimal 모듈 기본값과 같다)
+DEFAULT_PRECISION = 28
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# 숫자(지수 표기 포함), 연산자, 괄호, 공백 중 하나와 일치한다. 나머지 한 글자는 잘못된 문자로 잡는다.
+TOKEN_PATTERN = re.compile(r'\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|([-+*/×÷−()])|(\S))')
+
+
+def tokenize(text, backend='float'):
+    tokens = []
+    for number, operator, invalid in TOKEN_PATTERN.findall(text):
+        if number:
+            tokens.append(parse_number(number, backend))
+        elif operator:
+            tokens.append(OPERATOR_ALIASES.get(operator, operator))
+        elif invalid:
+            raise ExpressionError(f'알 수 없는 문자: {invalid}')
+    return tokens
+
+
+# decimal 과 fraction 방식은 숫자 문자열을 그대로 변환하므로 입력한 값이 정확히 보존된다.
+def parse_number(text, backend='float'):
+    try:
+        if backend == 'decimal':
+            return Decimal(text)
+        if backend == 'fraction':
+            return Fraction(text)
+        if '.' in text or 'e' in text or 'E' in text:
+            return float(text)
+        return int(text)
+    except ValueError:
+        raise ExpressionError(f'잘못된 숫자: {text}') from None
+
+
+class Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.code = []
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def advance(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError('빈 수식입니다.')
+        self.parse_expression(1)
+        if self.position != len(self.tokens):
+            raise ExpressionError(f'예상하지 못한 토큰: {self.peek()}')
+        return tuple(self.code)
+
+    # 우선순위가 min_precedence 이상인 이항 연산자를 왼쪽부터 묶는다.
+    def parse_expression(self, min_precedence):
+        self.parse_unary()
+        while True:
+            operator = self.peek()
+            precedence = BINARY_PRECEDENCE.get(operator) if isinstance(operator, str) else None
+            if precedence is None or precedence < min_precedence:
+                return
+            self.advance()
+            self.parse_expression(precedence + 1)
+            self.code.append((BINARY_OPCODES[operator], None))
+
+    def parse_unary(self):
+        token = self.advance()
+        if token == '-':
+            self.parse_unary()
+            self.code.append((NEG, None))
+        elif token == '+':
+            self.parse_unary()
+        elif token == '(':
+            self.parse_expression(1)
+            if self.advance() != ')':
+                raise ExpressionError('괄호가 닫히지 않았습니다.')
+        elif token is None or isinstance(token, str):
+            raise ExpressionError('피연산자가 필요합니다.')
+        else:
+            self.code.append((PUSH, token))
+
+
+@lru_cache(maxsize=4096)
+def compile_expression(text, backend='float'):
+    if backend not in BACKENDS:
+        raise ValueError(f'알 수 없는 숫자 방식: {backend}')
+    return Parser(tokenize(text, backend)).parse()
+
+
+def execute(code):
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for opcode, value in code:
+        if opcode == PUSH:
+            push(value)
+        elif opcode == NEG:
+            push(-pop())
+        else:
+            right = pop()
+            left = pop()
+            if opcode == ADD:
+                push(left + right)
+            elif opcode == SUB:
+                push(left - right)
+            elif opcode == MUL:
+                push(left * right)
+            else:
+                # 0 으로 나누면 ZeroDivisionError 가 그대로 올라간다.
+                push(left / right)
+    return stack[0]
+
+
+# 수식 문자열을 계산한다. 잘못된 수식은 ExpressionError, 0 으로 나누면 ZeroDivisionError
+# decimal 방식은 precision 자리 유효 숫자로 계산하고, 0/0 같은 계산은 decimal.InvalidOperation(ArithmeticError)
+def evaluate(text, backend='float', precision=DEFAULT_PRECISION):
+    code = compile_expression(text, backend)
+    if backend == 'decimal':
+        with localcontext() as context:
+            context.prec = precision
+            return execute(code)
+    return execute(code)
+
+
+# Decimal 이나 Fraction 결과를 float 을 거치지 않고 소수점 아래 digits 자리로 반올림해서 문자열로 만든다.
+# round() 와 같이 가운데 값은 짝수 쪽으로 반올림하고, 끝의 0 과 소수점은 지운다.
+def format_exact(value, digits=6):
+    rounded = round(Fraction(value), digits)
+    scaled = rounded.numerator * 10 ** digits // rounded.denominator
+    if scaled == 0:
+        return '0'
+    integer, fraction = divmod(abs(scaled), 10 ** digits)
+    sign = '-' if scaled < 0 else ''
+    return f'{sign}{integer}.{fraction:0{digits}d}'.rstrip('0').rstrip('.')